@@ -0,0 +1,410 @@
+"""
+This module benchmarks the fuzzy logic model on synthetic lab records.
+
+    python benchmark.py run --output bench.json
+    python benchmark.py compare baseline.json bench.json --threshold 0.1
+    python benchmark.py workers --rows 200000 --workers 1 2 4 8
+    python benchmark.py defuzz data.xlsx --resolutions 101 1001
+    python benchmark.py footprint
+    python benchmark.py parity data.xlsx --tolerance 1e-9
+
+run measures cold import time, predict latency, compute throughput and the
+stages of generate_report and writes them as JSON. compare exits with
+status 1 when a metric is worse than the baseline by more than the
+threshold. workers prints how compute scales with the number of processes.
+defuzz compares the speed and accuracy of the defuzzification methods and
+footprint the build time and memory of the compact model and skfuzzy's.
+parity exits with status 1 when predict_batch differs from
+predict(..., mode="skfuzzy") by more than the tolerance on any row.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from importlib import metadata
+import numpy as np
+import pandas as pd
+import fuzzy_logic
+import inference
+import parse_input_and_output
+from metrics import MetricsAccumulator
+from parse_input_and_output import INPUT_COLUMNS, compute
+
+COMPUTE_SIZES = [1000, 10000, 100000, 1000000]
+
+# valid input ranges of fibre, liquid limit and omc
+INPUT_RANGES = [(0, 1.75), (46.2, 82.6), (22, 36.2)]
+
+
+def synthetic_frame(rows: int, seed: int = 0):
+    """
+    Lab records with inputs sampled uniformly from the valid ranges
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        column: rng.uniform(low, high, rows)
+        for column, (low, high) in zip(INPUT_COLUMNS, INPUT_RANGES)
+    })
+
+
+def bench_workers(rows: int = 200000, worker_counts: list | None = None, seed: int = 0):
+    """
+    Times compute() at each worker count and checks every run returns the
+    same predictions as the first one
+    """
+    if worker_counts is None:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+            worker_counts.append(worker_counts[-1] * 2)
+
+    results = []
+    reference = None
+    for workers in worker_counts:
+        df = synthetic_frame(rows, seed)
+        start = time.perf_counter()
+        compute(df, workers=workers)
+        seconds = time.perf_counter() - start
+
+        predicted = df["Predicted CBR"].to_numpy()
+        if reference is None:
+            reference = predicted
+        elif not np.array_equal(reference, predicted, equal_nan=True):
+            raise AssertionError(f"Predictions with {workers} workers differ from {worker_counts[0]} worker(s)")
+        results.append({"workers": workers, "seconds": seconds, "rows_per_second": rows / seconds})
+    return results
+
+
+def _metric(value: float, unit: str, better: str):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def bench_import(repeat: int = 5):
+    """
+    Wall time of importing fuzzy_logic, and of importing it and making the
+    first prediction, in fresh interpreters
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    scripts = {
+        "import_fuzzy_logic": "import fuzzy_logic",
+        "import_and_first_predict": "import fuzzy_logic; fuzzy_logic.predict(0.5, 60, 28)",
+    }
+    # make sure the compiled rulebase cache exists, a cold cache is a one off
+    fuzzy_logic.get_rule_index()
+    metrics = {}
+    for name, script in scripts.items():
+        timer = f"import time; start = time.perf_counter(); {script}; print(time.perf_counter() - start)"
+        runs = [
+            float(subprocess.run([sys.executable, "-c", timer], cwd=here, check=True,
+                                 capture_output=True, text=True).stdout)
+            for _ in range(repeat)
+        ]
+        metrics[name] = _metric(float(np.median(runs)), "s", "lower")
+    return metrics
+
+
+def bench_predict(calls: int = 5000, seed: int = 0):
+    """
+    Latency percentiles of single predict calls on random valid inputs
+    """
+    df = synthetic_frame(calls, seed)
+    fuzzy_logic.get_rule_index()
+    latencies = np.empty(calls)
+    for i, row in enumerate(df[INPUT_COLUMNS].to_numpy()):
+        start = time.perf_counter()
+        try:
+            fuzzy_logic.predict(*row)
+        except ValueError:
+            pass
+        latencies[i] = time.perf_counter() - start
+    return {
+        f"predict_p{p}": _metric(float(np.percentile(latencies, p)) * 1e6, "us", "lower")
+        for p in (50, 90, 99)
+    }
+
+
+def bench_compute(sizes: list = COMPUTE_SIZES, seed: int = 0, workers: int = 1):
+    """
+    Rows per second of compute() on synthetic datasets of each size
+    """
+    metrics = {}
+    for rows in sizes:
+        df = synthetic_frame(rows, seed)
+        start = time.perf_counter()
+        compute(df, workers=workers)
+        seconds = time.perf_counter() - start
+        metrics[f"compute_{rows}_rows"] = _metric(rows / seconds, "rows/s", "higher")
+    return metrics
+
+
+def bench_report(rows: int = 10000, seed: int = 0, workers: int = 1):
+    """
+    Wall time of generate_report and of each of its stages, run in a scratch
+    directory so the real reports are left alone. The report is generated
+    twice, so charts are rendered first without and then with the hashes of
+    the previous render.
+    """
+    df = compute(synthetic_frame(rows, seed))
+    noise = np.random.default_rng(seed).normal(0, 1, rows)
+    df["CBR"] = df["Predicted CBR"].fillna(df["Predicted CBR"].mean()) + noise
+    df["Predicted CBR"] = df["Predicted CBR"].fillna(df["CBR"])
+
+    metrics = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            for run_name in ("cold", "warm"):
+                timings = {}
+                start = time.perf_counter()
+                parse_input_and_output.generate_report(df, workers, timings)
+                metrics[f"report_total_{run_name}"] = _metric(time.perf_counter() - start, "s", "lower")
+                if run_name == "warm":
+                    timings = {"render": timings["render"]}
+                for stage, seconds in timings.items():
+                    name = f"render_{run_name}" if stage == "render" else stage
+                    metrics[f"report_{name}"] = _metric(seconds, "s", "lower")
+        finally:
+            os.chdir(cwd)
+    return metrics
+
+
+def bench_defuzz(file: str = "data.xlsx", resolutions: list | None = None, repeat: int = 20):
+    """
+    Speed and accuracy of each defuzzification on the rows of file: the
+    current sampled path, the sampled path at each resolution and the
+    analytic centroid, which the others are measured against
+    """
+    if resolutions is None:
+        resolutions = [101, 1001]
+    df = parse_input_and_output.get_file_content(file)
+    inputs = [df[column].to_numpy(dtype=float) for column in INPUT_COLUMNS]
+    fuzzy_logic.get_rule_index()
+    variants = [("sampled", "exact", None)]
+    variants += [(f"sampled@{resolution}", "exact", resolution) for resolution in resolutions]
+    variants += [("analytic", "analytic", None)]
+
+    outputs = {}
+    results = []
+    for name, mode, resolution in variants:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            predicted = fuzzy_logic.predict_batch(*inputs, mode=mode, resolution=resolution)
+        seconds = (time.perf_counter() - start) / repeat
+        outputs[name] = predicted
+        accuracy = MetricsAccumulator().update(df["CBR"].to_numpy(dtype=float), predicted).result()
+        results.append({"method": name, "seconds": seconds, "rows_per_second": len(df) / seconds,
+                        "r_squared": accuracy["r_squared"], "rmse": accuracy["rmse"]})
+    for result in results:
+        difference = np.abs(outputs[result["method"]] - outputs["analytic"])
+        result["max_diff_vs_analytic"] = float(np.nanmax(difference))
+        result["mean_diff_vs_analytic"] = float(np.nanmean(difference))
+    return results
+
+
+def check_parity(file: str = "data.xlsx", tolerance: float = 1e-9):
+    """
+    Largest difference between predict_batch and the original skfuzzy
+    simulation over the rows of file, and the rows beyond tolerance. Rows
+    where no rule fires must be undefined in both.
+    """
+    df = parse_input_and_output.get_file_content(file)
+    inputs = [df[column].to_numpy(dtype=float) for column in INPUT_COLUMNS]
+    batch = fuzzy_logic.predict_batch(*inputs)
+    reference = np.empty(len(df))
+    for i, row in enumerate(zip(*inputs)):
+        try:
+            reference[i] = fuzzy_logic.predict(*row, mode="skfuzzy")
+        except ValueError:
+            reference[i] = np.nan
+    difference = np.abs(batch - reference)
+    mismatched = (np.isnan(batch) != np.isnan(reference)) | (difference > tolerance)
+    return {
+        "rows": len(df),
+        "tolerance": tolerance,
+        "max_diff": float(np.nanmax(difference)) if np.isfinite(difference).any() else 0.0,
+        "failures": np.flatnonzero(mismatched).tolist(),
+    }
+
+
+def _deep_size(obj):
+    """
+    Bytes reachable from obj, not counting modules, classes and functions
+    """
+    skip = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+    seen, size, stack = set(), 0, [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, skip):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        stack.extend(gc.get_referents(item))
+    return size
+
+
+def bench_footprint():
+    """
+    Build time and memory of the skfuzzy prediction_control against the
+    compact compiled model, from model.py already imported
+    """
+    import compact
+    import model
+    from skfuzzy import control as ctrl
+    metrics = {}
+
+    start = time.perf_counter()
+    compiled = compact.from_rulebase(fuzzy_logic.compile_rulebase())
+    metrics["compact_compile"] = _metric(time.perf_counter() - start, "s", "lower")
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "model.npz")
+        compact.save_model(compiled, path, "")
+        metrics["compact_file_size"] = _metric(os.path.getsize(path), "bytes", "lower")
+        start = time.perf_counter()
+        rulebase = compact.to_rulebase(compact.load_model(path))
+        index = inference.index_rules(rulebase)
+        metrics["compact_load"] = _metric(time.perf_counter() - start, "s", "lower")
+    metrics["compact_arrays"] = _metric(compact.nbytes(compiled), "bytes", "lower")
+    metrics["compact_expanded"] = _metric(_deep_size((rulebase, index)), "bytes", "lower")
+
+    start = time.perf_counter()
+    control = ctrl.ControlSystem(model.rules)
+    simulation = ctrl.ControlSystemSimulation(control)
+    metrics["skfuzzy_build"] = _metric(time.perf_counter() - start, "s", "lower")
+    metrics["skfuzzy_control"] = _metric(_deep_size(control), "bytes", "lower")
+    metrics["skfuzzy_simulation"] = _metric(_deep_size(simulation), "bytes", "lower")
+    return metrics
+
+
+def _versions():
+    versions = {"python": platform.python_version()}
+    for package in ("numpy", "pandas", "scikit-fuzzy", "matplotlib", "openpyxl"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def run(sizes: list = COMPUTE_SIZES, calls: int = 5000, report_rows: int = 10000, seed: int = 0,
+        workers: int = 1):
+    """
+    Runs every benchmark and returns the results as a JSON serializable dict
+    """
+    metrics = {}
+    metrics.update(bench_import())
+    metrics.update(bench_predict(calls, seed))
+    metrics.update(bench_compute(sizes, seed))
+    metrics.update(bench_report(report_rows, seed, workers))
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.platform(),
+        "cpus": os.cpu_count(),
+        "versions": _versions(),
+        "seed": seed,
+        "metrics": metrics,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1):
+    """
+    Lists the metrics present in both results that got worse than the
+    baseline by more than threshold, as a fraction of the baseline value
+    """
+    regressions = []
+    for name, base in baseline["metrics"].items():
+        if name not in current["metrics"]:
+            continue
+        value = current["metrics"][name]["value"]
+        # a zero baseline has no relative change to compare against
+        if base["value"] == 0:
+            continue
+        if base["better"] == "lower":
+            change = (value - base["value"]) / base["value"]
+        else:
+            change = (base["value"] - value) / base["value"]
+        if change > threshold:
+            regressions.append({"metric": name, "baseline": base["value"], "current": value,
+                                "unit": base["unit"], "worse_by": change})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the fuzzy logic model")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmark suite")
+    run_parser.add_argument("--output", default="bench.json")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=COMPUTE_SIZES)
+    run_parser.add_argument("--calls", type=int, default=5000)
+    run_parser.add_argument("--report-rows", type=int, default=10000)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--workers", type=int, default=1, help="processes rendering the report charts")
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    workers = commands.add_parser("workers", help="throughput of compute() by worker count")
+    workers.add_argument("--rows", type=int, default=200000)
+    workers.add_argument("--workers", type=int, nargs="+")
+    workers.add_argument("--seed", type=int, default=0)
+    defuzz = commands.add_parser("defuzz", help="speed and accuracy of the defuzzification methods")
+    defuzz.add_argument("file", nargs="?", default="data.xlsx")
+    defuzz.add_argument("--resolutions", type=int, nargs="+", default=[101, 1001])
+    defuzz.add_argument("--repeat", type=int, default=20)
+    commands.add_parser("footprint", help="build time and memory of the compact model and prediction_control")
+    parity = commands.add_parser("parity", help="check predict_batch against the skfuzzy simulation")
+    parity.add_argument("file", nargs="?", default="data.xlsx")
+    parity.add_argument("--tolerance", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(args.sizes, args.calls, args.report_rows, args.seed, args.workers)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        for name, metric in results["metrics"].items():
+            print(f"{name:<28} {metric['value']:14.4f} {metric['unit']}")
+
+    elif args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['metric']}: {regression['baseline']:.4f} -> "
+                  f"{regression['current']:.4f} {regression['unit']} ({regression['worse_by']:.0%} worse)")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+    elif args.command == "workers":
+        for result in bench_workers(args.rows, args.workers, args.seed):
+            print(f"{result['workers']:>3} workers: {result['seconds']:8.3f} s  {result['rows_per_second']:12.0f} rows/s")
+
+    elif args.command == "defuzz":
+        print(f"{'method':<16} {'ms':>9} {'rows/s':>10} {'R-squared':>10} {'RMSE':>8} {'max diff':>10} {'mean diff':>10}")
+        for result in bench_defuzz(args.file, args.resolutions, args.repeat):
+            print(f"{result['method']:<16} {result['seconds'] * 1000:9.3f} {result['rows_per_second']:10.0f} "
+                  f"{result['r_squared']:10.6f} {result['rmse']:8.5f} {result['max_diff_vs_analytic']:10.2e} "
+                  f"{result['mean_diff_vs_analytic']:10.2e}")
+
+    elif args.command == "footprint":
+        for name, metric in bench_footprint().items():
+            print(f"{name:<20} {metric['value']:14.4f} {metric['unit']}")
+
+    elif args.command == "parity":
+        result = check_parity(args.file, args.tolerance)
+        print(f"{result['rows']} rows, max difference {result['max_diff']:.2e} (tolerance {result['tolerance']:.0e})")
+        if result["failures"]:
+            print(f"Rows beyond tolerance: {result['failures']}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
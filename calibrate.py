@@ -0,0 +1,236 @@
+"""
+This module calibrates the membership functions and the rule consequents
+of the fuzzy logic model against lab data.
+
+A candidate model is the [a, b, c] breakpoints of every triangular term
+plus the CBR term each rule points to. Candidates are scored with the
+vectorized inference engine on the whole dataset at once and searched with
+a seeded (1 + lambda) evolution strategy whose offspring are scored in a
+process pool. The same seed gives the same result for any number of
+workers.
+
+    python calibrate.py data.xlsx --candidates 20000 --workers 4 --seed 0
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import fuzzy_logic
+import inference
+from parse_input_and_output import INPUT_COLUMNS, calc_mape, calc_r_squared, calc_rmse, get_file_content
+
+POPULATION = 256
+# initial breakpoint step, as a fraction of each universe's span
+SIGMA = 0.02
+# chance of each rule moving its consequent one term up or down
+CONSEQUENT_RATE = 0.01
+# narrowest allowed triangle side, as a fraction of the universe's span
+MIN_WIDTH = 0.01
+
+_scoring = None
+
+
+def _universes(rulebase: inference.Rulebase):
+    return (*rulebase.input_universes, rulebase.output_universe)
+
+
+def candidate_of(rulebase: inference.Rulebase):
+    """
+    Breakpoints of every term, one (terms, 3) array per variable, and the
+    consequent of every rule of the rulebase
+    """
+    params = tuple(np.array(p, dtype=float) for p in (*rulebase.input_params, rulebase.output_params))
+    return params, rulebase.rules[:, -1].astype(np.int8)
+
+
+def build_rulebase(base: inference.Rulebase, params: tuple, consequents: np.ndarray):
+    """
+    The rulebase of base with its terms resampled from params and its
+    rules pointing at consequents
+    """
+    mfs = [inference.trimf(universe, terms.T[:, :, None]) for universe, terms in zip(_universes(base), params)]
+    rules = base.rules.copy()
+    rules[:, -1] = consequents
+    return base._replace(input_mfs=tuple(mfs[:-1]), output_mfs=mfs[-1], rules=rules,
+                         input_params=tuple(params[:-1]), output_params=params[-1])
+
+
+def predict(base: inference.Rulebase, params: tuple, consequents: np.ndarray, inputs: list,
+            method: str = "sampled"):
+    """
+    Predictions of a candidate for the inputs, nan where no rule fires
+    """
+    rulebase = build_rulebase(base, params, consequents)
+    return inference.infer(rulebase, *inputs, index=inference.index_rules(rulebase), method=method)
+
+
+def score(base: inference.Rulebase, params: tuple, consequents: np.ndarray, inputs: list,
+          actual: np.ndarray, method: str = "sampled"):
+    """
+    RMSE of a candidate, infinite when it leaves a row without a prediction
+    """
+    predicted = predict(base, params, consequents, inputs, method)
+    if np.isnan(predicted).any():
+        return np.inf
+    return float(np.sqrt(np.mean((actual - predicted) ** 2)))
+
+
+def _init_scoring(base, inputs, actual, method):
+    global _scoring
+    _scoring = (base, inputs, actual, method)
+
+
+def _score_chunk(candidates: list):
+    base, inputs, actual, method = _scoring
+    return [score(base, params, consequents, inputs, actual, method) for params, consequents in candidates]
+
+
+def mutate(params: tuple, consequents: np.ndarray, spans: list, sigma: float, rng: np.random.Generator,
+           n_outputs: int, consequent_rate: float = CONSEQUENT_RATE):
+    """
+    Moves every breakpoint by a normal step of sigma times its universe's
+    span and shifts some consequents to a neighbouring term. Breakpoints are
+    kept ordered with sides at least MIN_WIDTH of the span wide.
+    """
+    mutated = []
+    for terms, span in zip(params, spans):
+        terms = np.sort(terms + rng.normal(0, sigma * span, terms.shape), axis=1)
+        width = MIN_WIDTH * span
+        terms[:, 1] = np.maximum(terms[:, 1], terms[:, 0] + width)
+        terms[:, 2] = np.maximum(terms[:, 2], terms[:, 1] + width)
+        mutated.append(terms)
+    consequents = consequents.copy()
+    if consequent_rate:
+        moved = rng.random(len(consequents)) < consequent_rate
+        steps = rng.choice(np.array([-1, 1], dtype=np.int8), len(consequents))
+        consequents[moved] = np.clip(consequents[moved] + steps[moved], 0, n_outputs - 1)
+    return tuple(mutated), consequents
+
+
+def calibrate(df: pd.DataFrame, candidates: int = 20000, population: int = POPULATION, workers: int = 1,
+              seed: int = 0, method: str = "sampled", tune_consequents: bool = True, sigma: float = SIGMA):
+    """
+    Searches for the breakpoints and consequents with the lowest RMSE on
+    df, starting from the current model, and returns the best candidate
+    with the search history. Step sizes follow the one fifth success rule.
+    """
+    base = fuzzy_logic.get_rulebase()
+    inputs = [df[column].to_numpy(dtype=float) for column in INPUT_COLUMNS]
+    actual = df["CBR"].to_numpy(dtype=float)
+    spans = [universe[-1] - universe[0] for universe in _universes(base)]
+    n_outputs = len(base.output_mfs)
+    rng = np.random.default_rng(seed)
+
+    best = candidate_of(base)
+    best_score = initial_score = score(base, *best, inputs, actual, method)
+    history = [best_score]
+    evaluated = 0
+    started = time.perf_counter()
+    pool = ProcessPoolExecutor(workers, initializer=_init_scoring,
+                               initargs=(base, inputs, actual, method)) if workers > 1 else None
+    if pool is None:
+        _init_scoring(base, inputs, actual, method)
+    try:
+        while evaluated < candidates:
+            size = min(population, candidates - evaluated)
+            children = [mutate(*best, spans, sigma, rng, n_outputs, CONSEQUENT_RATE if tune_consequents else 0)
+                        for _ in range(size)]
+            if pool is None:
+                scores = _score_chunk(children)
+            else:
+                chunks = [list(chunk) for chunk in np.array_split(np.arange(size), workers * 4) if len(chunk)]
+                scores = [s for part in pool.map(_score_chunk, [[children[i] for i in chunk] for chunk in chunks])
+                          for s in part]
+            evaluated += size
+
+            scores = np.array(scores)
+            improved = scores < best_score
+            sigma *= 1.22 if improved.mean() > 0.2 else 0.82
+            if improved.any():
+                winner = int(np.argmin(scores))
+                best, best_score = children[winner], float(scores[winner])
+            history.append(best_score)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    seconds = time.perf_counter() - started
+
+    return {
+        "params": best[0],
+        "consequents": best[1],
+        "rmse": best_score,
+        "initial_rmse": initial_score,
+        "evaluated": evaluated,
+        "seconds": seconds,
+        "candidates_per_minute": evaluated / seconds * 60 if seconds else 0.0,
+        "history": history,
+    }
+
+
+def write_calibration(df: pd.DataFrame, result: dict, path: str = "./reports/calibration.json",
+                      method: str = "sampled"):
+    """
+    Writes the calibrated breakpoints and rule table with the R-squared, MAPE
+    and RMSE of the calibrated model on df, and returns those metrics. Each
+    rule is reported with its row in the rulebase and the name of the
+    model.py rule it came from.
+    """
+    base = fuzzy_logic.get_rulebase()
+    labels = fuzzy_logic.VARIABLE_LABELS
+    inputs = [df[column].to_numpy(dtype=float) for column in INPUT_COLUMNS]
+    scored = df.copy()
+    scored["Predicted CBR"] = predict(base, result["params"], result["consequents"], inputs, method)
+    metrics = {"r_squared": calc_r_squared(scored), "mape": calc_mape(scored), "rmse": calc_rmse(scored)}
+
+    names = base.rule_names
+    rules = []
+    for rule_id, (rule, consequent) in enumerate(zip(base.rules, result["consequents"])):
+        antecedents = " & ".join(f"{label}{term + 1}" for label, term in zip(labels, rule[:-1]))
+        rules.append({"rule": rule_id, "name": names[rule_id] if rule_id < len(names) else None,
+                      "antecedents": antecedents, "consequent": f"{labels[-1]}{consequent + 1}",
+                      "changed": bool(consequent != rule[-1])})
+    output = {
+        "metrics": metrics,
+        "initial_rmse": result["initial_rmse"],
+        "evaluated": result["evaluated"],
+        "candidates_per_minute": result["candidates_per_minute"],
+        "breakpoints": {
+            label: {f"{label}{i + 1}": [float(x) for x in abc] for i, abc in enumerate(terms)}
+            for label, terms in zip(labels, result["params"])
+        },
+        "rules": rules,
+        "history": result["history"],
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(output, f, indent=2)
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the membership functions and rules against lab data")
+    parser.add_argument("file", nargs="?", default="data.xlsx")
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--population", type=int, default=POPULATION)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--method", choices=["sampled", "analytic"], default="sampled")
+    parser.add_argument("--keep-consequents", action="store_true", help="only tune the breakpoints")
+    parser.add_argument("--output", default="./reports/calibration.json")
+    args = parser.parse_args()
+
+    df = get_file_content(args.file)
+    result = calibrate(df, args.candidates, args.population, args.workers, args.seed, args.method,
+                       not args.keep_consequents)
+    metrics = write_calibration(df, result, args.output, args.method)
+    print(f"Evaluated {result['evaluated']} candidates ({result['candidates_per_minute']:.0f} per minute)")
+    print(f"RMSE {result['initial_rmse']:.4f} -> {metrics['rmse']:.4f}, "
+          f"R-squared {metrics['r_squared']:.4f}, MAPE {metrics['mape']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+This module renders the report charts. Charts are drawn on standalone Agg
+figures instead of through pyplot, can be rendered in a process pool, and
+are skipped when a hash of everything they are drawn from matches the one
+recorded when the file was last written.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from typing import NamedTuple
+import numpy as np
+
+# bump when the drawing code changes so cached charts are redrawn
+CHART_VERSION = 1
+MANIFEST = ".chart_hashes.json"
+
+
+class ChartJob(NamedTuple):
+    """
+    A chart to render: draw(*args) writes it to path
+    """
+    path: str
+    draw: object
+    args: tuple
+    digest: str
+
+
+def _digest(*parts):
+    digest = hashlib.sha256(f"{CHART_VERSION}:{metadata.version('matplotlib')}".encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(part, dtype=float)
+            digest.update(str(part.shape).encode())
+            digest.update(part.tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def _figure():
+    from matplotlib.figure import Figure
+    fig = Figure()
+    return fig, fig.subplots()
+
+
+def draw_membership(path: str, universe: np.ndarray, mfs: np.ndarray, label: str):
+    """
+    Draws the membership functions of one variable the way skfuzzy's
+    FuzzyVariable.view does
+    """
+    fig, ax = _figure()
+    ax.set_ylim([0, 1.01])
+    ax.set_xlim([universe.min(), universe.max()])
+    for i, mf in enumerate(mfs):
+        ax.plot(universe, mf, label=f"{label}{i + 1}", linewidth=1)
+    ax.legend(framealpha=0.5)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.get_xaxis().tick_bottom()
+    ax.get_yaxis().tick_left()
+    ax.tick_params(direction='out')
+    ax.set_ylabel('Membership')
+    ax.set_xlabel(label)
+    fig.savefig(path)
+
+
+def draw_best_fit(path: str, predicted: np.ndarray, actual: np.ndarray, coeff: tuple):
+    """
+    Scatter of actual against predicted cbr with the best fit line
+    """
+    fig, ax = _figure()
+    ax.scatter(predicted, actual, label="Data points")
+    ax.plot(predicted, np.poly1d(coeff)(predicted), color='red', label="Best fit line")
+    ax.set_title("Fitness Plot")
+    ax.set_xlabel("Predicted values")
+    ax.set_ylabel("Actual values")
+    ax.legend()
+    fig.savefig(path)
+
+
+def draw_slice(path: str, x: np.ndarray, y: np.ndarray, values: np.ndarray, x_label: str, y_label: str,
+               title: str):
+    """
+    Heat map of values, shaped (len(x), len(y)), with regions where no rule
+    fires left blank
+    """
+    fig, ax = _figure()
+    mesh = ax.pcolormesh(x, y, np.ma.masked_invalid(values).T, shading='auto')
+    fig.colorbar(mesh, ax=ax, label="CBR")
+    ax.set_title(title)
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    fig.savefig(path)
+
+
+def draw_partial_dependence(path: str, curves: list, labels: tuple):
+    """
+    One panel per input of mean cbr against the input, curves holding the
+    (x, mean, coverage) of each
+    """
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(4 * len(curves), 3.5), layout='constrained')
+    for ax, (x, mean, coverage), label in zip(fig.subplots(1, len(curves)), curves, labels):
+        ax.plot(x, mean)
+        ax.set_xlabel(label)
+        ax.set_ylabel("Mean CBR")
+        if np.any(coverage < 1):
+            ax.set_title(f"rules fire for {np.nanmean(coverage):.0%} of points", fontsize='small')
+    fig.savefig(path)
+
+
+def membership_jobs(rulebase, labels: tuple, directory: str = './reports'):
+    """
+    One job per variable of the rulebase, written to <label>_view.png
+    """
+    variables = list(zip(rulebase.input_universes, rulebase.input_mfs)) + [
+        (rulebase.output_universe, rulebase.output_mfs)
+    ]
+    return [
+        ChartJob(os.path.join(directory, f"{label}_view.png"), draw_membership, (universe, mfs, label),
+                 _digest("membership", universe, mfs, label))
+        for (universe, mfs), label in zip(variables, labels)
+    ]
+
+
+def best_fit_job(predicted: np.ndarray, actual: np.ndarray, coeff: tuple, directory: str = './reports'):
+    """
+    Job for the fitness plot, written to Best_fit.png
+    """
+    predicted = np.asarray(predicted, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    return ChartJob(os.path.join(directory, "Best_fit.png"), draw_best_fit, (predicted, actual, tuple(coeff)),
+                    _digest("best_fit", predicted, actual, tuple(coeff)))
+
+
+def _run(job: ChartJob):
+    job.draw(job.path, *job.args)
+    return job.path
+
+
+def render(jobs: list, workers: int = 1):
+    """
+    Renders the jobs whose output is missing or out of date and returns
+    their paths. With workers > 1 they are drawn in a process pool.
+    """
+    manifests = {}
+    stale = []
+    for job in jobs:
+        directory = os.path.dirname(job.path) or '.'
+        if directory not in manifests:
+            manifest_path = os.path.join(directory, MANIFEST)
+            manifests[directory] = {}
+            if os.path.exists(manifest_path):
+                with open(manifest_path) as f:
+                    manifests[directory] = json.load(f)
+        name = os.path.basename(job.path)
+        if manifests[directory].get(name) != job.digest or not os.path.exists(job.path):
+            os.makedirs(directory, exist_ok=True)
+            stale.append(job)
+
+    if workers > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(stale))) as pool:
+            list(pool.map(_run, stale))
+    else:
+        for job in stale:
+            _run(job)
+
+    for job in stale:
+        directory = os.path.dirname(job.path) or '.'
+        manifests[directory][os.path.basename(job.path)] = job.digest
+    for directory, manifest in manifests.items():
+        with open(os.path.join(directory, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+    return [job.path for job in stale]
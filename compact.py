@@ -0,0 +1,154 @@
+"""
+This module provides the compact form of the compiled model: universe
+bounds and membership function breakpoints in float arrays and the rules
+as an int8 table of term indices. It only needs NumPy, so a model saved
+with save_model can be loaded and run without skfuzzy.
+"""
+
+import os
+import tempfile
+import zipfile
+from typing import NamedTuple
+import numpy as np
+import inference
+
+# bump when the layout of CompactModel or the files it is saved to changes
+FORMAT_VERSION = 3
+
+
+class CompactModel(NamedTuple):
+    """
+    universes holds the start, step and number of points of each variable,
+    inputs first and the output last. Universes that are not evenly spaced
+    have a nan step and their points are stored in order in
+    universe_points. term_counts holds the number of terms of each variable
+    and breakpoints the [a, b, c] of every triangular term, all variables
+    one after the other. Every row of rules holds the term index of each
+    input followed by the output term index and rule_names the name of the
+    model rule behind each row.
+    """
+    universes: np.ndarray
+    universe_points: np.ndarray
+    term_counts: np.ndarray
+    breakpoints: np.ndarray
+    rules: np.ndarray
+    rule_names: np.ndarray
+
+
+def check_rules(rules: np.ndarray):
+    """
+    Finds rules that repeat an earlier rule, as (row, earlier row) pairs,
+    and groups of rows that share antecedents but point at different
+    consequents
+    """
+    first = {}
+    duplicates = []
+    consequents = {}
+    for row, rule in enumerate(rules):
+        key = tuple(int(term) for term in rule)
+        if key in first:
+            duplicates.append((row, first[key]))
+        else:
+            first[key] = row
+            consequents.setdefault(key[:-1], []).append(row)
+    conflicts = [rows for rows in consequents.values() if len(rows) > 1]
+    return duplicates, conflicts
+
+
+def _is_even(universe: np.ndarray):
+    if len(universe) < 2:
+        return False
+    step = universe[1] - universe[0]
+    return bool(np.array_equal(universe[0] + step * np.arange(len(universe)), universe))
+
+
+def from_rulebase(rulebase: inference.Rulebase):
+    """
+    Compact form of a rulebase. Evenly spaced universes are reduced to their
+    start, step and number of points, the others are stored in full.
+    """
+    universes = (*rulebase.input_universes, rulebase.output_universe)
+    params = (*rulebase.input_params, rulebase.output_params)
+    even = [_is_even(universe) for universe in universes]
+    return CompactModel(
+        universes=np.array([
+            [universe[0], universe[1] - universe[0] if is_even else np.nan, len(universe)]
+            for universe, is_even in zip(universes, even)
+        ]),
+        universe_points=np.concatenate(
+            [np.empty(0)] + [universe for universe, is_even in zip(universes, even) if not is_even]
+        ).astype(float),
+        term_counts=np.array([len(terms) for terms in params], dtype=np.int64),
+        breakpoints=np.concatenate([np.reshape(terms, (-1, 3)) for terms in params]).astype(float),
+        rules=rulebase.rules.astype(np.int8),
+        rule_names=np.array(rulebase.rule_names, dtype=str),
+    )
+
+
+def to_rulebase(model: CompactModel):
+    """
+    Expands the compact model into the inference.Rulebase the engine runs on
+    """
+    universes = []
+    offset = 0
+    for start, step, count in model.universes:
+        count = int(count)
+        if np.isnan(step):
+            universes.append(model.universe_points[offset:offset + count])
+            offset += count
+        else:
+            universes.append(start + step * np.arange(count))
+    params = np.split(model.breakpoints, np.cumsum(model.term_counts)[:-1])
+    mfs = [inference.trimf(universe, terms.T[:, :, None]) for universe, terms in zip(universes, params)]
+    return inference.Rulebase(
+        input_universes=tuple(universes[:-1]),
+        input_mfs=tuple(mfs[:-1]),
+        output_universe=universes[-1],
+        output_mfs=mfs[-1],
+        rules=model.rules.astype(np.intp),
+        input_params=tuple(params[:-1]),
+        output_params=params[-1],
+        rule_names=tuple(str(name) for name in model.rule_names),
+    )
+
+
+def nbytes(model: CompactModel):
+    """
+    Bytes held by the arrays of the model
+    """
+    return sum(array.nbytes for array in model)
+
+
+def save_model(model: CompactModel, path: str, key: str):
+    """
+    Writes the model to an .npz file together with the key it was built for.
+    The file is written under a unique temporary name and then moved into
+    place, so processes saving at the same time never mix their writes.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, key=np.array(key), **model._asdict())
+        # mkstemp files are private, the cache may be shared
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_model(path: str, key: str | None = None):
+    """
+    Reads a model written by save_model. Returns None when the file is
+    missing, unreadable or was written for another key, any key is accepted
+    when key is None.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if key is not None and str(data["key"]) != key:
+                return None
+            return CompactModel(**{field: data[field] for field in CompactModel._fields})
+    except (zipfile.BadZipFile, OSError, ValueError, KeyError):
+        return None
@@ -0,0 +1,138 @@
+"""
+This module estimates how stable the report metrics are. The dataset is
+scored once and the predictions are reused by every k-fold split and
+bootstrap resample, which are scored in a process pool. Each resample
+draws from its own seed, so results do not depend on the number of
+workers.
+
+    python evaluation.py data.xlsx --folds 10 --bootstraps 2000 --workers 4
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import fuzzy_logic
+import inference
+from metrics import MetricsAccumulator
+from parse_input_and_output import compute, get_file_content
+
+METRICS = ("r_squared", "mape", "rmse")
+
+_arrays = None
+
+
+def _init_arrays(actual: np.ndarray, predicted: np.ndarray):
+    global _arrays
+    _arrays = (actual, predicted)
+
+
+def _score(index: np.ndarray):
+    actual, predicted = _arrays
+    result = MetricsAccumulator().update(actual[index], predicted[index]).result()
+    return [result[name] for name in METRICS]
+
+
+def _score_folds(folds: list):
+    return [_score(index) for index in folds]
+
+
+def _score_bootstraps(seeds: list):
+    n = len(_arrays[0])
+    return [_score(np.random.default_rng(seed).integers(0, n, n)) for seed in seeds]
+
+
+def _summary(values: np.ndarray, confidence: float):
+    tail = (1 - confidence) / 2 * 100
+    summary = {}
+    for name, column in zip(METRICS, values.T):
+        column = column[~np.isnan(column)]
+        if len(column) == 0:
+            summary[name] = {"mean": None, "std": None, "low": None, "high": None}
+            continue
+        low, high = np.percentile(column, [tail, 100 - tail])
+        summary[name] = {"mean": float(column.mean()), "std": float(column.std(ddof=1)) if len(column) > 1 else 0.0,
+                         "low": float(low), "high": float(high)}
+    return summary
+
+
+def _map(pool, function, tasks: list, workers: int):
+    chunks = [chunk for chunk in np.array_split(np.arange(len(tasks)), workers * 4) if len(chunk)]
+    batches = [[tasks[i] for i in chunk] for chunk in chunks]
+    scored = pool.map(function, batches) if pool is not None else map(function, batches)
+    return np.array([row for batch in scored for row in batch], dtype=float).reshape(-1, len(METRICS))
+
+
+def evaluate(df: pd.DataFrame, folds: int = 10, bootstraps: int = 1000, workers: int = 1, seed: int = 0,
+             confidence: float = 0.95):
+    """
+    Metrics on the whole dataset, on each of folds shuffled folds and over
+    bootstrap resamples, with percentile confidence intervals. Predictions
+    are only computed when df has no "Predicted CBR" column.
+    """
+    if "Predicted CBR" not in df:
+        df = compute(df, workers)
+    actual = df["CBR"].to_numpy(dtype=float)
+    predicted = df["Predicted CBR"].to_numpy(dtype=float)
+    rng = np.random.default_rng(seed)
+    fold_index = [np.sort(fold) for fold in np.array_split(rng.permutation(len(actual)), folds)]
+    # one seed per resample, drawn up front so workers cannot change them
+    bootstrap_seeds = [[seed, i] for i in range(bootstraps)]
+
+    pool = ProcessPoolExecutor(workers, initializer=_init_arrays, initargs=(actual, predicted)) if workers > 1 else None
+    if pool is None:
+        _init_arrays(actual, predicted)
+    try:
+        fold_values = _map(pool, _score_folds, fold_index, workers)
+        bootstrap_values = _map(pool, _score_bootstraps, bootstrap_seeds, workers)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    whole = MetricsAccumulator().update(actual, predicted).result()
+    return {
+        "rows": len(actual),
+        "fingerprint": inference.fingerprint(fuzzy_logic.get_rulebase()),
+        "seed": seed,
+        "confidence": confidence,
+        "metrics": {name: whole[name] for name in METRICS},
+        "folds": {
+            "k": folds,
+            "values": [dict(zip(METRICS, row)) for row in fold_values.tolist()],
+            "summary": _summary(fold_values, confidence),
+        },
+        "bootstrap": {
+            "resamples": bootstraps,
+            "summary": _summary(bootstrap_values, confidence),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="K-fold and bootstrap confidence intervals for the report metrics")
+    parser.add_argument("file", nargs="?", default="data.xlsx")
+    parser.add_argument("--folds", type=int, default=10)
+    parser.add_argument("--bootstraps", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--output", default="./reports/evaluation.json")
+    args = parser.parse_args()
+
+    result = evaluate(get_file_content(args.file), args.folds, args.bootstraps, args.workers, args.seed,
+                      args.confidence)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"{'metric':<10} {'value':>10} {'folds mean':>11} {'folds std':>10} "
+          f"{'bootstrap ' + format(args.confidence, '.0%') + ' CI':>26}")
+    for name in METRICS:
+        folds, bootstrap = result["folds"]["summary"][name], result["bootstrap"]["summary"][name]
+        print(f"{name:<10} {result['metrics'][name]:10.4f} {folds['mean']:11.4f} {folds['std']:10.4f} "
+              f"{bootstrap['low']:12.4f} - {bootstrap['high']:<11.4f}")
+
+
+if __name__ == "__main__":
+    main()
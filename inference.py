@@ -0,0 +1,349 @@
+"""
+This module provides a vectorized Mamdani inference engine for the fuzzy
+logic model. It works on plain NumPy arrays describing the rulebase so many
+samples can be scored at once instead of one ControlSystemSimulation call
+per sample.
+"""
+
+import hashlib
+import itertools
+import os
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+# rows scored per pass, keeps the intermediate arrays bounded
+BATCH_CHUNK = 8192
+
+# where the compiled model, response surfaces and prediction store are kept,
+# point CBR_CACHE_DIR at a writable directory on read only deployments
+CACHE_DIR = os.environ.get("CBR_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+
+
+class Rulebase(NamedTuple):
+    """
+    Array description of a Mamdani rulebase.
+
+    input_universes and input_mfs hold one entry per antecedent, output_mfs
+    has one row per consequent term and every row of rules holds the term
+    indices of the antecedents followed by the consequent term index.
+    input_params and output_params hold the [a, b, c] breakpoints of the
+    triangular terms the membership arrays were sampled from, and
+    rule_names the name of the model rule each row of rules came from.
+    """
+    input_universes: tuple
+    input_mfs: tuple
+    output_universe: np.ndarray
+    output_mfs: np.ndarray
+    rules: np.ndarray
+    input_params: tuple
+    output_params: np.ndarray
+    rule_names: tuple = ()
+
+
+class RuleIndex(NamedTuple):
+    """
+    Sparse lookup structure built from a Rulebase by index_rules.
+
+    segment_terms lists, per input and per universe segment, the terms that
+    can have non zero membership there. consequents maps a tuple of
+    antecedent term indices to the consequent terms of the matching rules,
+    padded with -1, and rule_ids holds the row of rules each of those came
+    from.
+    """
+    segment_terms: tuple
+    input_mfs: tuple
+    consequents: np.ndarray
+    rule_ids: np.ndarray
+
+
+def fingerprint(rulebase: Rulebase):
+    """
+    Hash of the universes, membership functions and rules. It changes
+    whenever the model changes, so it is used to key anything derived from it.
+    """
+    digest = hashlib.sha256()
+    arrays = (*rulebase.input_universes, *rulebase.input_mfs, rulebase.output_universe,
+              rulebase.output_mfs, rulebase.rules, *rulebase.input_params, rulebase.output_params)
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=float)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def index_rules(rulebase: Rulebase):
+    """
+    Compiles the rulebase into a RuleIndex.
+
+    For every segment of every input universe only the terms whose sampled
+    membership is non zero at either end of the segment are kept, and the
+    rules are laid out in a dense table keyed by the antecedent term indices,
+    so inference never has to look at rules that cannot fire.
+    """
+    segment_terms, input_mfs = [], []
+    for mfs in rulebase.input_mfs:
+        n_terms = len(mfs)
+        nonzero = (mfs[:, :-1] > 0) | (mfs[:, 1:] > 0)
+        width = max(int(nonzero.sum(axis=0).max()), 1)
+        # active terms first in each segment, unused slots point at an extra
+        # term whose membership is always zero
+        order = np.argsort(~nonzero, axis=0, kind="stable")[:width]
+        active = np.take_along_axis(nonzero, order, axis=0)
+        segment_terms.append(np.where(active, order, n_terms).T.astype(np.intp))
+        input_mfs.append(np.vstack([mfs, np.zeros(mfs.shape[1])]))
+
+    shape = tuple(len(mfs) + 1 for mfs in rulebase.input_mfs)
+    keys = np.ravel_multi_index(tuple(rulebase.rules[:, :-1].T), shape)
+    # a repeated rule fires exactly like the first copy
+    _, first = np.unique(keys * len(rulebase.output_mfs) + rulebase.rules[:, -1], return_index=True)
+    keys = keys[first]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    slots = np.arange(len(keys)) - np.repeat(starts, np.diff(np.r_[starts, len(keys)]))
+    depth = int(slots.max()) + 1
+    consequents = np.full(shape + (depth,), -1, dtype=np.intp)
+    rule_ids = np.full(shape + (depth,), -1, dtype=np.intp)
+    consequents.reshape(-1, depth)[keys, slots] = rulebase.rules[first, -1]
+    rule_ids.reshape(-1, depth)[keys, slots] = first
+
+    return RuleIndex(tuple(segment_terms), tuple(input_mfs), consequents, rule_ids)
+
+
+def fuzzify(universe: np.ndarray, segment_terms: np.ndarray, mfs: np.ndarray, values: np.ndarray):
+    """
+    Indices and memberships of the terms that can be active for each value,
+    both of shape (samples, active terms). Values outside the universe are
+    clipped to its bounds like skfuzzy does.
+    """
+    values = np.clip(values, universe[0], universe[-1])
+    segment = np.clip(np.searchsorted(universe, values, side="right") - 1, 0, len(universe) - 2)
+    terms = segment_terms[segment]
+    x1, x2 = universe[segment], universe[segment + 1]
+    y1, y2 = mfs[terms, segment[:, None]], mfs[terms, segment[:, None] + 1]
+    memberships = y1 + (y2 - y1) * ((values - x1) / (x2 - x1))[:, None]
+    return terms, memberships
+
+
+def activate(index: RuleIndex, terms: list, memberships: list):
+    """
+    Firing strength, consequent term and rule id of every rule that matches
+    a combination of active terms, each of shape (samples, candidates).
+    Antecedents are combined with min, candidates without a rule have
+    consequent and rule id -1.
+    """
+    strengths, consequents, rule_ids = [], [], []
+    for combo in itertools.product(*[range(t.shape[1]) for t in terms]):
+        strength = memberships[0][:, combo[0]]
+        for i in range(1, len(combo)):
+            strength = np.minimum(strength, memberships[i][:, combo[i]])
+        key = tuple(t[:, c] for t, c in zip(terms, combo))
+        found = index.consequents[key]
+        strengths.append(np.broadcast_to(strength[:, None], found.shape))
+        consequents.append(found)
+        rule_ids.append(index.rule_ids[key])
+    return (np.concatenate(strengths, axis=1), np.concatenate(consequents, axis=1),
+            np.concatenate(rule_ids, axis=1))
+
+
+def aggregate(strengths: np.ndarray, consequents: np.ndarray, n_outputs: int):
+    """
+    Clipping level of each consequent term, shape (samples, output terms),
+    the max over the rules pointing to it
+    """
+    cuts = np.zeros((strengths.shape[0], n_outputs))
+    for term in range(n_outputs):
+        cuts[:, term] = np.where(consequents == term, strengths, 0.0).max(axis=1)
+    return cuts
+
+
+def _cut_points(universe: np.ndarray, mf: np.ndarray, cuts: np.ndarray):
+    """
+    Points of the universe where mf crosses each cut level, found by linear
+    interpolation. Segments without a crossing return their left edge, which
+    is already part of the universe.
+    """
+    above = np.where(cuts[:, None] == 0, mf > cuts[:, None], mf >= cuts[:, None])
+    crossing = above[:, 1:] != above[:, :-1]
+    x1, x2 = universe[:-1], universe[1:]
+    y1, y2 = mf[:-1], mf[1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        points = x1 + (cuts[:, None] - y1) * (x2 - x1) / (y2 - y1)
+    return np.where(crossing, points, x1)
+
+
+def trimf(x: np.ndarray, params: np.ndarray):
+    """
+    Triangular membership of x for breakpoints [a, b, c], as skfuzzy's trimf
+    """
+    a, b, c = params
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rising = np.where(b > a, (x - a) / (b - a), 1.0)
+        falling = np.where(c > b, (c - x) / (c - b), 1.0)
+    return np.where((x < a) | (x > c), 0.0, np.minimum(rising, falling))
+
+
+def _check_resolution(resolution: int | None):
+    # fewer than three points cannot hold the peak of a triangular term
+    if resolution is not None and resolution < 3:
+        raise ValueError(f"resolution must be at least 3, got {resolution}")
+
+
+def defuzzify(rulebase: Rulebase, cuts: np.ndarray, resolution: int | None = None):
+    """
+    Centroid of the aggregated output for each row of cuts.
+
+    The output universe is upsampled with the points where each term meets
+    its cut level and the centroid of the resulting piecewise linear shape
+    is taken, which is what skfuzzy does for a single sample. A zero cut
+    only adds points already on the universe, so terms that did not fire do
+    not change the result. Rows where no rule fired are NaN.
+
+    With a resolution the output terms are resampled from their breakpoints
+    on that many evenly spaced points of the universe instead, trading
+    speed for accuracy. Only the output universe is resampled, the inputs
+    are still fuzzified on their own universes. resolution must be at
+    least 3.
+    """
+    _check_resolution(resolution)
+    universe = rulebase.output_universe
+    output_mfs = rulebase.output_mfs
+    if resolution is not None:
+        universe = np.linspace(universe[0], universe[-1], resolution)
+        output_mfs = np.array([trimf(universe, params) for params in rulebase.output_params])
+    terms = range(len(output_mfs))
+
+    points = [np.broadcast_to(universe, (cuts.shape[0], len(universe)))]
+    for term in terms:
+        points.append(_cut_points(universe, output_mfs[term], cuts[:, term]))
+    x = np.sort(np.concatenate(points, axis=1), axis=1)
+
+    y = np.zeros_like(x)
+    for term in terms:
+        upsampled = np.interp(x, universe, output_mfs[term], left=0.0, right=0.0)
+        np.maximum(y, np.minimum(cuts[:, term][:, None], upsampled), out=y)
+
+    x1, x2, y1, y2 = x[:, :-1], x[:, 1:], y[:, :-1], y[:, 1:]
+    width = x2 - x1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moment = np.where(
+            y1 == y2, 0.5 * (x1 + x2),
+            np.where(y1 == 0, 2.0 / 3.0 * width + x1,
+                     np.where(y2 == 0, 1.0 / 3.0 * width + x1,
+                              2.0 / 3.0 * width * (y2 + 0.5 * y1) / (y1 + y2) + x1)))
+    area = np.where(y1 == y2, width * y1,
+                    np.where(y1 == 0, 0.5 * width * y2,
+                             np.where(y2 == 0, 0.5 * width * y1, 0.5 * width * (y1 + y2))))
+    skip = ((y1 == 0) & (y2 == 0)) | (width == 0)
+    moment = np.where(skip, 0.0, moment)
+    area = np.where(skip, 0.0, area)
+
+    total = area.sum(axis=1)
+    result = (moment * area).sum(axis=1) / np.fmax(total, np.finfo(float).eps)
+    return np.where(y.sum(axis=1) == 0, np.nan, result)
+
+
+def defuzzify_analytic(rulebase: Rulebase, cuts: np.ndarray):
+    """
+    Exact centroid over the output universe of the continuous triangular
+    terms, each clipped at its cut level and combined with max.
+
+    The aggregated shape is linear between the points where any two of the
+    rising edges, falling edges and cut levels meet, so its area and moment
+    are summed in closed form over those pieces with no sampling. Rows where
+    no rule fired are NaN.
+    """
+    low, high = rulebase.output_universe[0], rulebase.output_universe[-1]
+    params = rulebase.output_params
+    n_samples, n_terms = cuts.shape
+    a, b, c = params[:, 0], params[:, 1], params[:, 2]
+
+    # every edge and cut level as a line y = slope * x + offset, per term
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.concatenate([1 / (b - a), -1 / (c - b), np.zeros(n_terms)])
+        offsets = np.concatenate([-a / (b - a), c / (c - b), np.zeros(n_terms)])
+    owner = np.tile(np.arange(n_terms), 3)
+    offsets = np.broadcast_to(offsets, (n_samples, 3 * n_terms)).copy()
+    offsets[:, 2 * n_terms:] = cuts
+    first, second = np.triu_indices(3 * n_terms, k=1)
+    # only lines of different, overlapping terms that are not parallel meet
+    overlapping = np.maximum(a[owner[first]], a[owner[second]]) < np.minimum(c[owner[first]], c[owner[second]])
+    pairs = (owner[first] != owner[second]) & overlapping & (slopes[first] != slopes[second])
+    first, second = first[pairs], second[pairs]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossings = (offsets[:, second] - offsets[:, first]) / (slopes[first] - slopes[second])
+    a_cut = a + cuts * (b - a)
+    c_cut = c - cuts * (c - b)
+    x = np.concatenate([np.broadcast_to(params.ravel(), (n_samples, params.size)), a_cut, c_cut,
+                        crossings, np.full((n_samples, 2), [low, high])], axis=1)
+    x = np.sort(np.clip(np.where(np.isfinite(x), x, low), low, high), axis=1)
+
+    y = np.zeros_like(x)
+    for term in range(n_terms):
+        np.maximum(y, np.minimum(cuts[:, term][:, None], trimf(x, params[term][:, None, None])), out=y)
+
+    x1, x2, y1, y2 = x[:, :-1], x[:, 1:], y[:, :-1], y[:, 1:]
+    width = x2 - x1
+    area = (0.5 * width * (y1 + y2)).sum(axis=1)
+    moment = (width / 6 * (x1 * (2 * y1 + y2) + x2 * (y1 + 2 * y2))).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(area > 0, moment / area, np.nan)
+
+
+def infer(rulebase: Rulebase, *inputs, index: RuleIndex | None = None, telemetry=None,
+          method: str = "sampled", resolution: int | None = None):
+    """
+    Crisp output for arrays of crisp inputs, one array per antecedent.
+    Samples for which no rule fires come back as NaN. Pass a prebuilt
+    index to avoid compiling it on every call and a telemetry.Telemetry
+    to record stage timings and rule firing.
+
+    method="sampled" defuzzifies on the output universe like skfuzzy, or on
+    resolution evenly spaced points when given, and method="analytic" uses
+    defuzzify_analytic. resolution only resamples the output universe, the
+    inputs stay on the grids of rulebase.input_universes.
+    """
+    if method not in ("sampled", "analytic"):
+        raise ValueError(f"Unknown defuzzification method: {method}")
+    _check_resolution(resolution)
+    if index is None:
+        index = index_rules(rulebase)
+    inputs = [np.atleast_1d(np.asarray(values, dtype=float)) for values in inputs]
+    inputs = np.broadcast_arrays(*inputs)
+    shape = inputs[0].shape
+    flat = [values.ravel() for values in inputs]
+
+    output = np.empty(flat[0].shape[0])
+    # finer output universes mean wider intermediate arrays per row
+    step = BATCH_CHUNK
+    if resolution is not None:
+        step = max(1, BATCH_CHUNK * len(rulebase.output_universe) // resolution)
+    for start in range(0, len(output), step):
+        chunk = [values[start:start + step] for values in flat]
+        started = time.perf_counter()
+        terms, memberships = zip(*[
+            fuzzify(universe, segment_terms, mfs, values)
+            for universe, segment_terms, mfs, values
+            in zip(rulebase.input_universes, index.segment_terms, index.input_mfs, chunk)
+        ])
+        fuzzified = time.perf_counter()
+        strengths, consequents, rule_ids = activate(index, terms, memberships)
+        activated = time.perf_counter()
+        cuts = aggregate(strengths, consequents, len(rulebase.output_mfs))
+        aggregated = time.perf_counter()
+        if method == "analytic":
+            result = defuzzify_analytic(rulebase, cuts)
+        else:
+            result = defuzzify(rulebase, cuts, resolution)
+        output[start:start + step] = result
+
+        if telemetry is not None:
+            telemetry.record(
+                chunk, result, strengths, rule_ids,
+                fuzzification=fuzzified - started,
+                activation=activated - fuzzified,
+                aggregation=aggregated - activated,
+                defuzzification=time.perf_counter() - aggregated,
+            )
+    return output.reshape(shape)
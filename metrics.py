@@ -0,0 +1,111 @@
+"""
+This module provides a single pass, mergeable accumulator for the report
+metrics. Chunks can be added as they are scored and accumulators built in
+different processes can be merged, so reports do not need the whole
+dataset in memory.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class MetricsAccumulator:
+    """
+    Running R-squared, MAPE, RMSE, MAE and best fit line of actual against
+    predicted values.
+
+    Means, spreads and the co-moment are merged with Chan's pairwise
+    formulas rather than kept as raw sums of squares, which keeps them
+    accurate over long streams. Rows where either value is missing are
+    skipped and counted, and rows with an actual value of zero are left out
+    of MAPE and counted instead of making it infinite.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean_actual = 0.0
+        self.mean_predicted = 0.0
+        self.m2_actual = 0.0
+        self.m2_predicted = 0.0
+        self.comoment = 0.0
+        self.ss_res = 0.0
+        self.abs_error = 0.0
+        self.abs_pct_error = 0.0
+        self.zero_actual = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, actual: str = "CBR", predicted: str = "Predicted CBR"):
+        accumulator = cls()
+        accumulator.update(df[actual].to_numpy(dtype=float), df[predicted].to_numpy(dtype=float))
+        return accumulator
+
+    def update(self, actual: np.ndarray, predicted: np.ndarray):
+        """
+        Adds a chunk of values
+        """
+        actual = np.asarray(actual, dtype=float)
+        predicted = np.asarray(predicted, dtype=float)
+        valid = ~(np.isnan(actual) | np.isnan(predicted))
+        self.skipped += int((~valid).sum())
+        actual, predicted = actual[valid], predicted[valid]
+        if len(actual) == 0:
+            return self
+
+        chunk = MetricsAccumulator()
+        chunk.count = len(actual)
+        chunk.mean_actual = actual.mean()
+        chunk.mean_predicted = predicted.mean()
+        chunk.m2_actual = np.sum((actual - chunk.mean_actual) ** 2)
+        chunk.m2_predicted = np.sum((predicted - chunk.mean_predicted) ** 2)
+        chunk.comoment = np.sum((actual - chunk.mean_actual) * (predicted - chunk.mean_predicted))
+        error = actual - predicted
+        chunk.ss_res = np.sum(error ** 2)
+        chunk.abs_error = np.sum(np.abs(error))
+        nonzero = actual != 0
+        chunk.zero_actual = int((~nonzero).sum())
+        chunk.abs_pct_error = np.sum(np.abs(error[nonzero] / actual[nonzero]))
+        return self.merge(chunk)
+
+    def merge(self, other: "MetricsAccumulator"):
+        """
+        Folds another accumulator into this one and returns this one
+        """
+        self.skipped += other.skipped
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta_actual = other.mean_actual - self.mean_actual
+        delta_predicted = other.mean_predicted - self.mean_predicted
+        weight = self.count * other.count / count
+
+        self.m2_actual += other.m2_actual + delta_actual ** 2 * weight
+        self.m2_predicted += other.m2_predicted + delta_predicted ** 2 * weight
+        self.comoment += other.comoment + delta_actual * delta_predicted * weight
+        self.mean_actual += delta_actual * other.count / count
+        self.mean_predicted += delta_predicted * other.count / count
+        self.count = count
+        self.ss_res += other.ss_res
+        self.abs_error += other.abs_error
+        self.abs_pct_error += other.abs_pct_error
+        self.zero_actual += other.zero_actual
+        return self
+
+    def result(self):
+        """
+        The metrics as a dict, nan where they are undefined
+        """
+        n = self.count
+        nonzero = n - self.zero_actual
+        slope = self.comoment / self.m2_predicted if self.m2_predicted else np.nan
+        return {
+            "count": n,
+            "r_squared": float(1 - self.ss_res / self.m2_actual) if self.m2_actual else np.nan,
+            "mape": float(self.abs_pct_error / nonzero * 100) if nonzero else np.nan,
+            "rmse": float(np.sqrt(self.ss_res / n)) if n else np.nan,
+            "mae": float(self.abs_error / n) if n else np.nan,
+            "slope": float(slope),
+            "intercept": float(self.mean_actual - slope * self.mean_predicted),
+            "zero_actual": self.zero_actual,
+            "skipped": self.skipped,
+        }
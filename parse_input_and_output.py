@@ -1,83 +1,149 @@
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import os
-from fuzzy_logic import predict, view_charts
+import time
+from concurrent.futures import ProcessPoolExecutor
+import charts
+import inference
+from fuzzy_logic import chart_jobs, get_rule_index, get_rulebase, get_telemetry, predict_batch
+from metrics import MetricsAccumulator
+from prediction_store import STORE_PATH, PredictionStore, row_hashes
+
+INPUT_COLUMNS = ["Percentages of addition of fiber (%)", "Liquid Limit (%)", "Optimum Moisture Content"]
 
 def get_file_content(file: str):
     df = pd.read_excel(file, "Sheet1")
     return df
 
-def compute(df: pd.DataFrame):
-    for index, row in df.iterrows():
-        # add a new column "predicted cbr" to the dataframe and input the answers of each row
-        df.at[index, "Predicted CBR"] = predict(row["Percentages of addition of fiber (%)"], row["Liquid Limit (%)"], row["Optimum Moisture Content"])
+def scoring_pool(workers: int):
+    """
+    Process pool for compute, each worker loading its own compiled model
+    """
+    # compile and cache the rulebase once so the workers only load it
+    get_rule_index()
+    return ProcessPoolExecutor(max_workers=workers, initializer=get_rule_index)
+
+def compute(df: pd.DataFrame, workers: int = 1, pool: ProcessPoolExecutor | None = None):
+    """
+    Adds a "Predicted CBR" column to the dataframe. With workers > 1 the rows
+    are split into chunks scored in a process pool and put back in the
+    original order. Pass a pool from scoring_pool to reuse it across calls,
+    otherwise one is started for this call. Rows where no rule fires are
+    left as nan.
+    """
+    inputs = [df[column].to_numpy(dtype=float) for column in INPUT_COLUMNS]
+    if workers > 1 and len(df) > 1:
+        chunks = [np.array_split(values, workers * 4) for values in inputs]
+        if pool is None:
+            with scoring_pool(workers) as pool:
+                predicted = np.concatenate(list(pool.map(predict_batch, *chunks)))
+        else:
+            predicted = np.concatenate(list(pool.map(predict_batch, *chunks)))
+    else:
+        predicted = predict_batch(*inputs)
+    df["Predicted CBR"] = predicted
     return df
 
-def plot_regression(df: pd.DataFrame):
-    fig, ax = plt.subplots()
-    actual = df["CBR"]
-    predicted = df["Predicted CBR"]
-    
-    # Scatter plot
-    ax.scatter(predicted, actual, label="Data points")
-    
-    # Adding regression line
-    coeff = np.polyfit(predicted, actual, 1)
-    poly1d_fn = np.poly1d(coeff)
-    ax.plot(predicted, poly1d_fn(predicted), color='red', label="Best fit line")
-    ax.set_title("Fitness Plot")
-    ax.set_xlabel("Predicted values")
-    ax.set_ylabel("Actual values")
-    ax.legend()
-    
-    plt.savefig('./reports/Best_fit.png')
-    plt.close()
+def compute_incremental(df: pd.DataFrame, workers: int = 1, store_path: str = STORE_PATH):
+    """
+    Adds a "Predicted CBR" column like compute, scoring only the rows whose
+    inputs are not in the prediction store for the current rulebase yet
+    and storing their predictions. Returns the dataframe and the number of
+    rows that were scored.
+    """
+    inputs = np.column_stack([df[column].to_numpy(dtype=float) for column in INPUT_COLUMNS])
+    hashes = row_hashes(inputs)
+    store = PredictionStore(inference.fingerprint(get_rulebase()), store_path)
+    try:
+        predicted, found = store.lookup(hashes)
+        missing = np.flatnonzero(~found)
+        if len(missing):
+            scored = compute(pd.DataFrame(inputs[missing], columns=INPUT_COLUMNS), workers)["Predicted CBR"].to_numpy()
+            predicted[missing] = scored
+            store.insert([hashes[i] for i in missing], scored)
+    finally:
+        store.close()
+    df["Predicted CBR"] = predicted
+    return df, len(missing)
+
+def plot_regression(df: pd.DataFrame, coeff: tuple | None = None):
+    if coeff is None:
+        result = MetricsAccumulator.from_frame(df).result()
+        coeff = (result["slope"], result["intercept"])
+    charts.render([charts.best_fit_job(df["Predicted CBR"], df["CBR"], coeff)])
 
 def calc_r_squared(df: pd.DataFrame):
-    actual = df["CBR"]
-    predicted = df["Predicted CBR"]
-    mean = np.mean(actual)
-    ss_res = np.sum((actual - predicted) ** 2)
-    ss_tot = np.sum((actual - mean) ** 2)
-    r_squared = 1 - (ss_res / ss_tot)
-    return r_squared
+    return MetricsAccumulator.from_frame(df).result()["r_squared"]
 
 def calc_mape(df: pd.DataFrame):
-    actual = df["CBR"]
-    predicted = df["Predicted CBR"]
-    mape = np.mean(np.abs((actual - predicted) / actual)) * 100
-    return mape
+    # rows with an actual CBR of zero are left out instead of giving inf
+    return MetricsAccumulator.from_frame(df).result()["mape"]
 
 def calc_rmse(df: pd.DataFrame):
-    actual = df["CBR"]
-    predicted = df["Predicted CBR"]
-    rmse = np.sqrt(np.mean((actual - predicted) ** 2))
-    return rmse
+    return MetricsAccumulator.from_frame(df).result()["rmse"]
 
 
-def generate_report(df: pd.DataFrame):
+def write_report(metrics: dict):
     """
-    Plots the relationship between predicted and Actual CBR and also calculates the
-    R-squared, Mean Absolute Percentage Error and the Root Mean Squared Error
+    Writes the result of a MetricsAccumulator to reports/report.txt
     """
     os.makedirs('reports', exist_ok=True)
-    df.to_excel(excel_writer="./reports/predictions.xlsx", sheet_name="Result")
-    view_charts()
-    plot_regression(df)
-    rmse = calc_rmse(df)
-    r_squared = calc_r_squared(df)
-    mape = calc_mape(df)
     with open("./reports/report.txt", "w") as f:
-        f.write(f"R-squared: {r_squared}\n")
-        f.write(f"Mean Absolute Percentage Error: {mape}\n")
-        f.write(f"Root Mean Squared Error: {rmse}\n")
+        f.write(f"R-squared: {metrics['r_squared']}\n")
+        f.write(f"Mean Absolute Percentage Error: {metrics['mape']}\n")
+        f.write(f"Root Mean Squared Error: {metrics['rmse']}\n")
+        f.write(f"Mean Absolute Error: {metrics['mae']}\n")
+        f.write(f"Best fit line: actual = {metrics['slope']} * predicted + {metrics['intercept']}\n")
+        if metrics["zero_actual"]:
+            f.write(f"Rows with zero actual CBR left out of MAPE: {metrics['zero_actual']}\n")
+        if metrics["skipped"]:
+            f.write(f"Rows without a prediction or actual CBR: {metrics['skipped']}\n")
 
 
-def main(file: str):
+def generate_report(df: pd.DataFrame, workers: int = 1, timings: dict | None = None):
+    """
+    Plots the relationship between predicted and Actual CBR and also calculates the
+    R-squared, Mean Absolute Percentage Error, Root Mean Squared Error and
+    Mean Absolute Error in a single pass. Charts are rendered in a pool of
+    workers and skipped when their inputs have not changed. When timings is
+    given the wall time of each stage is stored in it by name.
+    """
+    def stage(name, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        if timings is not None:
+            timings[name] = time.perf_counter() - start
+        return result
+
+    os.makedirs('reports', exist_ok=True)
+    stage("to_excel", lambda: df.to_excel(excel_writer="./reports/predictions.xlsx", sheet_name="Result"))
+    metrics = stage("metrics", lambda: MetricsAccumulator.from_frame(df).result())
+    best_fit = charts.best_fit_job(df["Predicted CBR"], df["CBR"], (metrics["slope"], metrics["intercept"]))
+    stage("render", charts.render, chart_jobs() + [best_fit], workers)
+    stage("write_report", write_report, metrics)
+    if get_telemetry() is not None:
+        stage("write_telemetry", get_telemetry().write, "./reports/telemetry.json")
+
+
+def main(file: str, workers: int = 1, incremental: bool = False):
+    """
+    Scores the file and writes the report. With incremental=True
+    predictions are taken from the prediction store where possible and
+    only new or changed rows are scored.
+    """
     df = get_file_content(file)
-    df = compute(df)
-    generate_report(df)
+    if incremental:
+        df, _ = compute_incremental(df, workers)
+    else:
+        df = compute(df, workers)
+    generate_report(df, workers)
 
 if __name__ == "__main__":
-    main("data.xlsx")
+    parser = argparse.ArgumentParser(description="Score a lab dataset and write the report")
+    parser.add_argument("file", nargs="?", default="data.xlsx")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--incremental", action="store_true",
+                        help="only score rows that are not in the prediction store yet")
+    args = parser.parse_args()
+    main(args.file, args.workers, args.incremental)
@@ -0,0 +1,110 @@
+"""
+This module provides an optional memoization layer around predict.
+Inputs are quantized to configurable steps before they are used as cache
+keys, so repeated mixes reported at lab precision hit the same entry.
+"""
+
+import threading
+from collections import OrderedDict
+import inference
+import fuzzy_logic
+
+# fibre is rounded to 0.01%, liquid limit and omc to the one decimal they are
+# reported to
+DEFAULT_STEPS = (0.01, 0.1, 0.1)
+DEFAULT_MAXSIZE = 4096
+
+
+class PredictionCache:
+    """
+    Bounded, thread-safe LRU cache of predictions.
+
+    Each input is rounded to a multiple of its step (None keeps it exact) and
+    the prediction is made for the rounded inputs, so a cached value does not
+    depend on which caller filled it. Entries are dropped when the compiled
+    rulebase changes.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, steps: tuple = DEFAULT_STEPS, mode: str = "exact"):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.steps = steps
+        self.mode = mode
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._rulebase = None
+        self._fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _quantize(self, values: tuple):
+        return tuple(
+            float(value) if step is None else round(float(value) / step)
+            for value, step in zip(values, self.steps)
+        )
+
+    def _check_rulebase(self):
+        # called with the lock held
+        rulebase = fuzzy_logic.get_rulebase()
+        if rulebase is self._rulebase:
+            return
+        fingerprint = inference.fingerprint(rulebase)
+        if self._fingerprint is not None and fingerprint != self._fingerprint:
+            self._entries.clear()
+            self.invalidations += 1
+        self._rulebase = rulebase
+        self._fingerprint = fingerprint
+
+    def predict(self, fibre: float | int, liquid_limit: float | int, omc: float | int):
+        """
+        Calculates the resulting cbr for the quantized inputs, reusing a
+        previous result when there is one
+        """
+        key = self._quantize((fibre, liquid_limit, omc))
+        with self._lock:
+            self._check_rulebase()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        inputs = [
+            value if step is None else k * step
+            for value, k, step in zip((fibre, liquid_limit, omc), key, self.steps)
+        ]
+        result = fuzzy_logic.predict(*inputs, mode=self.mode)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def clear(self):
+        """
+        Drops every entry, the counters are kept
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Counters as a JSON serializable dict
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
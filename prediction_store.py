@@ -0,0 +1,84 @@
+"""
+This module provides a persistent store of predictions in a local SQLite
+database, so repeated reports only score rows that are new or changed.
+Predictions are keyed by a hash of the input values of a row and the
+fingerprint of the rulebase that produced them.
+"""
+
+import hashlib
+import os
+import sqlite3
+import numpy as np
+import inference
+
+STORE_PATH = os.path.join(inference.CACHE_DIR, 'predictions.sqlite')
+
+
+def row_hashes(inputs: np.ndarray):
+    """
+    Hash of each row of a (rows, inputs) array of input values
+    """
+    # adding 0.0 turns -0.0 into 0.0 so both hash the same
+    rows = np.ascontiguousarray(np.asarray(inputs, dtype=np.float64) + 0.0)
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest() for row in rows]
+
+
+class PredictionStore:
+    """
+    Predictions of one rulebase version. Opening the store for a new
+    version deletes everything stored for the others. Rows where no rule
+    fires are stored too, as NULL, so they are not scored again.
+    """
+
+    def __init__(self, version: str, path: str = STORE_PATH):
+        self.version = version
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS predictions "
+                "(row_hash TEXT NOT NULL, version TEXT NOT NULL, cbr REAL, PRIMARY KEY (row_hash, version))"
+            )
+            self.invalidated = self._connection.execute(
+                "DELETE FROM predictions WHERE version != ?", (version,)
+            ).rowcount
+
+    def lookup(self, hashes: list):
+        """
+        Stored predictions for the hashes, and a mask of the ones found
+        """
+        with self._connection:
+            self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (position INTEGER, row_hash TEXT)")
+            self._connection.execute("DELETE FROM wanted")
+            self._connection.executemany("INSERT INTO wanted VALUES (?, ?)", enumerate(hashes))
+            found = self._connection.execute(
+                "SELECT wanted.position, predictions.cbr FROM wanted "
+                "JOIN predictions ON predictions.row_hash = wanted.row_hash AND predictions.version = ?",
+                (self.version,),
+            ).fetchall()
+        values = np.full(len(hashes), np.nan)
+        mask = np.zeros(len(hashes), dtype=bool)
+        if found:
+            positions, cbr = zip(*found)
+            positions = np.array(positions)
+            values[positions] = np.array(cbr, dtype=float)
+            mask[positions] = True
+        return values, mask
+
+    def insert(self, hashes: list, values: np.ndarray):
+        """
+        Stores predictions, nan values as NULL
+        """
+        rows = ((row_hash, self.version, None if np.isnan(value) else float(value))
+                for row_hash, value in zip(hashes, values))
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)", rows)
+
+    def __len__(self):
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM predictions WHERE version = ?", (self.version,)
+        ).fetchone()[0]
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,370 @@
+"""
+This module serves predictions over HTTP on a TCP port or a Unix socket,
+so services can share one loaded model instead of each embedding it.
+
+Concurrent requests are collected over a short window and scored together
+with fuzzy_logic.predict_batch, which only reads the compiled rulebase and
+never touches the shared skfuzzy simulation. Requests beyond max_pending
+are rejected with 503 instead of queueing without bound.
+
+    python server.py serve --port 8765 --window-ms 2
+    python server.py load --port 8765 --qps 2000 --duration 10
+
+POST /predict takes {"F": 0.5, "LL": 60, "OMC": 30} and returns
+{"CBR": ...}, or 422 when no rule fires for the inputs. GET /metrics
+returns latency percentiles, queue depth and batch sizes as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import fuzzy_logic
+
+WINDOW = 0.002
+MAX_BATCH = 1024
+MAX_PENDING = 4096
+MAX_BODY = 65536
+# latencies kept for the percentiles in /metrics
+LATENCY_SAMPLES = 10000
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+           422: "Unprocessable Entity", 503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    """
+    Raised when max_pending requests are already waiting to be scored
+    """
+
+
+class BadMessage(Exception):
+    """
+    Raised for a request that cannot be read, with the status to answer it with
+    """
+
+    def __init__(self, status: int, error: str):
+        super().__init__(error)
+        self.status = status
+
+
+class MicroBatcher:
+    """
+    Collects predictions requested within window seconds of each other and
+    scores them as one batch on a single worker thread
+    """
+
+    def __init__(self, window: float = WINDOW, max_batch: int = MAX_BATCH,
+                 max_pending: int = MAX_PENDING, mode: str = "exact"):
+        if mode not in ("exact", "analytic", "surface"):
+            raise ValueError(f"Unsupported mode for the server: {mode}")
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.mode = mode
+        self._pending = deque()
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.requests = 0
+        self.rejected = 0
+        self.undefined = 0
+        self.batches = 0
+        self.batched = 0
+        self.max_batch_seen = 0
+        self.max_depth = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    async def predict(self, fibre: float, liquid_limit: float, omc: float):
+        """
+        Queues one prediction and waits for the batch it lands in.
+        Returns nan when no rule fires.
+        """
+        if len(self._pending) >= self.max_pending:
+            self.rejected += 1
+            raise Overloaded()
+        self.requests += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((fibre, liquid_limit, omc, future, time.perf_counter()))
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._wakeup.set()
+        return await future
+
+    def _score(self, inputs: np.ndarray):
+        return fuzzy_logic.predict_batch(inputs[:, 0], inputs[:, 1], inputs[:, 2], mode=self.mode)
+
+    async def run(self):
+        """
+        Scores queued requests until cancelled. Raises when the rulebase
+        cannot be loaded, after cancelling the requests already queued.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            # compile the rulebase before the first request rather than during it
+            await loop.run_in_executor(self._executor, self._score, np.array([[0.0, 60.0, 30.0]]))
+            while True:
+                await self._wakeup.wait()
+                if len(self._pending) < self.max_batch:
+                    await asyncio.sleep(self.window)
+                while self._pending:
+                    batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+                    inputs = np.array([item[:3] for item in batch], dtype=float)
+                    try:
+                        results = await loop.run_in_executor(self._executor, self._score, inputs)
+                    except Exception as error:
+                        for *_, future, _ in batch:
+                            if not future.done():
+                                future.set_exception(error)
+                        continue
+                    finished = time.perf_counter()
+                    for (*_, future, queued), result in zip(batch, results):
+                        self.latencies.append(finished - queued)
+                        if not future.done():
+                            future.set_result(float(result))
+                    self.batches += 1
+                    self.batched += len(batch)
+                    self.max_batch_seen = max(self.max_batch_seen, len(batch))
+                    self.undefined += int(np.isnan(results).sum())
+                self._wakeup.clear()
+        finally:
+            for *_, future, _ in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=False)
+
+    def metrics(self):
+        """
+        Counters, queue depth and latency percentiles in milliseconds
+        """
+        latencies = np.array(self.latencies) * 1000
+        p50, p99 = np.percentile(latencies, [50, 99]).tolist() if len(latencies) else (None, None)
+        return {
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "undefined": self.undefined,
+            "queue_depth": len(self._pending),
+            "max_queue_depth": self.max_depth,
+            "batches": self.batches,
+            "mean_batch_size": self.batched / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "latency_ms": {"p50": p50, "p99": p99, "samples": len(latencies)},
+        }
+
+
+async def _read_message(reader: asyncio.StreamReader):
+    """
+    Reads the start line, headers and body of one HTTP/1.1 message
+    """
+    start = await reader.readline()
+    if not start:
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise BadMessage(400, "invalid Content-Length") from None
+    if length < 0:
+        raise BadMessage(400, "invalid Content-Length")
+    if length > MAX_BODY:
+        raise BadMessage(413, "body too large")
+    body = await reader.readexactly(length) if length else b""
+    return start.decode("latin-1").split(), headers, body
+
+
+def _response(status: int, payload: dict, close: bool = False):
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n")
+    if status == 503:
+        head += "Retry-After: 1\r\n"
+    return head.encode() + b"\r\n" + body
+
+
+async def _handle(batcher: MicroBatcher, method: str, path: str, body: bytes):
+    if method == "GET" and path == "/metrics":
+        return 200, batcher.metrics()
+    if method == "GET" and path == "/health":
+        return 200, {"status": "ok"}
+    if method != "POST" or path != "/predict":
+        return 404, {"error": f"{method} {path} not found"}
+    try:
+        values = json.loads(body)
+        inputs = [float(values[key]) for key in ("F", "LL", "OMC")]
+    except (ValueError, KeyError, TypeError):
+        return 400, {"error": 'expected {"F": ..., "LL": ..., "OMC": ...}'}
+    try:
+        result = await batcher.predict(*inputs)
+    except Overloaded:
+        return 503, {"error": "too many pending requests"}
+    if np.isnan(result):
+        return 422, {"error": f"No rule fires for F={inputs[0]}, LL={inputs[1]}, OMC={inputs[2]}"}
+    return 200, {"CBR": result}
+
+
+def connection_handler(batcher: MicroBatcher):
+    """
+    asyncio stream handler serving keep-alive HTTP/1.1 requests
+    """
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    message = await _read_message(reader)
+                except BadMessage as error:
+                    writer.write(_response(error.status, {"error": str(error)}, close=True))
+                    await writer.drain()
+                    break
+                if message is None or len(message[0]) < 2:
+                    break
+                (method, path, *_), headers, body = message
+                close = headers.get("connection", "").lower() == "close"
+                status, payload = await _handle(batcher, method, path, body)
+                writer.write(_response(status, payload, close))
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, unix: str | None = None,
+                window: float = WINDOW, max_batch: int = MAX_BATCH, max_pending: int = MAX_PENDING,
+                mode: str = "exact"):
+    """
+    Serves predictions until cancelled, on a Unix socket when unix is given.
+    Raises when the scoring task fails, for example because the rulebase
+    cannot be compiled, instead of leaving requests waiting forever.
+    """
+    batcher = MicroBatcher(window, max_batch, max_pending, mode)
+    scoring = asyncio.create_task(batcher.run())
+    if unix:
+        server = await asyncio.start_unix_server(connection_handler(batcher), path=unix)
+    else:
+        server = await asyncio.start_server(connection_handler(batcher), host, port)
+    serving = asyncio.create_task(server.serve_forever())
+    try:
+        async with server:
+            done, _ = await asyncio.wait({serving, scoring}, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+    finally:
+        serving.cancel()
+        scoring.cancel()
+
+
+async def _open(host: str, port: int, unix: str | None):
+    if unix:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, port)
+
+
+async def _post(connection: tuple, payload: bytes):
+    reader, writer = connection
+    writer.write(b"POST /predict HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 + f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    message = await _read_message(reader)
+    if message is None:
+        raise ConnectionError("server closed the connection")
+    return int(message[0][1])
+
+
+async def load_test(qps: float, duration: float, host: str = "127.0.0.1", port: int = 8765,
+                    unix: str | None = None, connections: int = 64, seed: int = 0):
+    """
+    Sends POST /predict at a fixed rate over a pool of keep-alive
+    connections and returns the status counts and latency percentiles.
+    Latency is measured from when each request was due to be sent, so
+    time spent waiting for a free connection counts against the server.
+    """
+    from benchmark import INPUT_RANGES
+    rng = np.random.default_rng(seed)
+    total = int(qps * duration)
+    inputs = np.column_stack([rng.uniform(low, high, total) for low, high in INPUT_RANGES])
+    pool = asyncio.Queue()
+    for _ in range(connections):
+        pool.put_nowait(await _open(host, port, unix))
+    latencies = np.full(total, np.nan)
+    statuses = {}
+
+    async def send(i: int, due: float):
+        payload = json.dumps(dict(zip(("F", "LL", "OMC"), inputs[i].tolist()))).encode()
+        connection = await pool.get()
+        try:
+            status = await _post(connection, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            status = "error"
+            connection = await _open(host, port, unix)
+        pool.put_nowait(connection)
+        latencies[i] = time.perf_counter() - due
+        statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        due = start + i / qps
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(i, due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    while not pool.empty():
+        pool.get_nowait()[1].close()
+
+    p50, p99 = np.percentile(latencies * 1000, [50, 99]) if total else (np.nan, np.nan)
+    return {
+        "target_qps": qps,
+        "achieved_qps": total / elapsed if elapsed else 0.0,
+        "requests": total,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "latency_ms": {"p50": float(p50), "p99": float(p99), "max": float(np.max(latencies) * 1000) if total else np.nan},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prediction server for the fuzzy logic model")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("serve", "run the server"), ("load", "generate load against a running server")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=8765)
+        command.add_argument("--unix", help="Unix socket path, used instead of host and port")
+    serve_parser = commands.choices["serve"]
+    serve_parser.add_argument("--window-ms", type=float, default=WINDOW * 1000)
+    serve_parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    serve_parser.add_argument("--max-pending", type=int, default=MAX_PENDING)
+    serve_parser.add_argument("--mode", choices=["exact", "analytic", "surface"], default="exact")
+    load_parser = commands.choices["load"]
+    load_parser.add_argument("--qps", type=float, default=1000)
+    load_parser.add_argument("--duration", type=float, default=10)
+    load_parser.add_argument("--connections", type=int, default=64)
+    load_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.unix, args.window_ms / 1000,
+                              args.max_batch, args.max_pending, args.mode))
+        except KeyboardInterrupt:
+            pass
+    else:
+        result = asyncio.run(load_test(args.qps, args.duration, args.host, args.port, args.unix,
+                                       args.connections, args.seed))
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
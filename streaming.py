@@ -0,0 +1,137 @@
+"""
+This module provides a streaming version of the report pipeline.
+Input rows are read in bounded chunks from Excel, CSV or Parquet files,
+scored, and appended to the output as they are produced, so memory use
+does not grow with the size of the dataset. Metrics are accumulated with
+metrics.MetricsAccumulator along the way.
+
+    python streaming.py data.xlsx --output ./reports/predictions.csv
+"""
+
+import argparse
+import os
+import pandas as pd
+from metrics import MetricsAccumulator
+from parse_input_and_output import compute, scoring_pool, write_report
+
+CHUNK_SIZE = 50000
+
+
+def _read_excel_chunks(file: str, chunk_size: int, sheet_name: str):
+    from openpyxl import load_workbook
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def _read_parquet_chunks(file: str, chunk_size: int):
+    import pyarrow.parquet as pq
+    for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+
+def read_chunks(file: str, chunk_size: int = CHUNK_SIZE, sheet_name: str = "Sheet1"):
+    """
+    Yields the rows of an .xlsx, .csv or .parquet file as dataframes of at
+    most chunk_size rows
+    """
+    extension = os.path.splitext(file)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        return _read_excel_chunks(file, chunk_size, sheet_name)
+    if extension == ".csv":
+        return pd.read_csv(file, chunksize=chunk_size)
+    if extension == ".parquet":
+        return _read_parquet_chunks(file, chunk_size)
+    raise ValueError(f"Unsupported input format: {extension}")
+
+
+def write_chunks(chunks, file: str, sheet_name: str = "Result"):
+    """
+    Writes an iterable of dataframes to an .xlsx, .csv or .parquet file,
+    one chunk at a time
+    """
+    extension = os.path.splitext(file)[1].lower()
+    if extension == ".csv":
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(file, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    elif extension in (".xlsx", ".xlsm"):
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(sheet_name)
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                sheet.append(list(chunk.columns))
+            for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False):
+                sheet.append(list(row))
+        workbook.save(file)
+    elif extension == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(file, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError(f"Unsupported output format: {extension}")
+
+
+def stream_report(file: str, output: str = "./reports/predictions.csv",
+                  chunk_size: int = CHUNK_SIZE, workers: int = 1):
+    """
+    Scores the file chunk by chunk, appending predictions to output and
+    writing the metrics of the whole dataset to reports/report.txt when it
+    has a "CBR" column. With workers > 1 one process pool scores every chunk.
+    """
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    accumulator = MetricsAccumulator()
+    pool = scoring_pool(workers) if workers > 1 else None
+
+    def scored():
+        for chunk in read_chunks(file, chunk_size):
+            chunk = compute(chunk, workers, pool)
+            if "CBR" in chunk:
+                accumulator.update(chunk["CBR"].to_numpy(dtype=float), chunk["Predicted CBR"].to_numpy())
+            yield chunk
+
+    try:
+        write_chunks(scored(), output)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    metrics = accumulator.result()
+    if metrics["count"]:
+        write_report(metrics)
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a lab dataset in bounded chunks")
+    parser.add_argument("file", help=".xlsx, .csv or .parquet input")
+    parser.add_argument("--output", default="./reports/predictions.csv")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    stream_report(args.file, args.output, args.chunk_size, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+This module provides the precomputed response surface of the fuzzy logic
+model. The exact engine is sampled once on a regular grid over the input
+universes, the table is saved as a .npy file keyed by the rulebase
+fingerprint and SURFACE_VERSION and queries are answered by multilinear interpolation.
+"""
+
+import itertools
+import json
+import os
+import tempfile
+from typing import NamedTuple
+
+import numpy as np
+
+import inference
+
+SURFACE_DIR = os.path.join(inference.CACHE_DIR, 'surface')
+
+# bump when the surface or the inference engine changes so cached tables
+# are rebuilt
+SURFACE_VERSION = 1
+
+# F every 0.025, LL every 0.25 and OMC every 0.125 over the default universes
+DEFAULT_SHAPE = (61, 145, 113)
+
+# random points the exact engine is checked at after a build
+ERROR_SAMPLES = 20000
+
+
+class Surface(NamedTuple):
+    """
+    A loaded response surface, table is memory-mapped read only.
+    """
+    table: np.ndarray
+    bounds: tuple
+    max_error: float
+
+
+def _grid_axes(rulebase: inference.Rulebase, shape: tuple):
+    return [
+        np.linspace(universe[0], universe[-1], n)
+        for universe, n in zip(rulebase.input_universes, shape)
+    ]
+
+
+def _shape_name(shape: tuple):
+    return "x".join(str(n) for n in shape)
+
+
+def _paths(rulebase: inference.Rulebase, shape: tuple, directory: str):
+    key = f"v{SURFACE_VERSION}-{inference.fingerprint(rulebase)[:16]}-{_shape_name(shape)}"
+    base = os.path.join(directory, key)
+    return base + ".npy", base + ".json"
+
+
+def _remove_stale(keep: tuple, shape: tuple, directory: str):
+    """
+    Deletes the tables and metadata of other rulebases or versions built
+    for the same shape
+    """
+    keep = {os.path.basename(path) for path in keep}
+    for name in os.listdir(directory):
+        if name not in keep and name.endswith((f"-{_shape_name(shape)}.npy", f"-{_shape_name(shape)}.json")):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def interpolate(surface: Surface, *inputs):
+    """
+    Multilinear interpolation of the table at the given inputs. Inputs are
+    clipped to the universes like the exact engine does. A query next to a
+    grid point where no rule fires returns nan.
+    """
+    inputs = np.broadcast_arrays(*[np.asarray(values, dtype=float) for values in inputs])
+    table = surface.table
+    index, frac = [], []
+    for values, (low, high), n in zip(inputs, surface.bounds, table.shape):
+        position = (np.clip(values, low, high) - low) / (high - low) * (n - 1)
+        i = np.minimum(np.floor(position).astype(np.intp), n - 2)
+        index.append(i)
+        frac.append(position - i)
+
+    result = np.zeros(inputs[0].shape)
+    for corner in itertools.product((0, 1), repeat=len(inputs)):
+        weight = np.ones(inputs[0].shape)
+        for offset, f in zip(corner, frac):
+            weight = weight * (f if offset else 1 - f)
+        result += weight * table[tuple(i + offset for i, offset in zip(index, corner))]
+    return result
+
+
+def build_surface(rulebase: inference.Rulebase, shape: tuple = DEFAULT_SHAPE,
+                  directory: str = SURFACE_DIR):
+    """
+    Samples the rulebase on the grid, writes the table and its metadata and
+    returns the loaded surface. The metadata records the largest difference
+    between the surface and the exact engine at random points. When the
+    directory cannot be written the table is only kept in memory.
+    """
+    table_path, meta_path = _paths(rulebase, shape, directory)
+    axes = _grid_axes(rulebase, shape)
+    index = inference.index_rules(rulebase)
+
+    # unique temporary names, so processes building at the same time never
+    # write into the same file
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, table_tmp = tempfile.mkstemp(dir=directory, suffix=".npy")
+        os.close(fd)
+        # mkstemp files are private, the cache may be shared
+        os.chmod(table_tmp, 0o644)
+        table = np.lib.format.open_memmap(table_tmp, mode="w+", dtype=np.float64, shape=shape)
+    except OSError:
+        table = None
+    in_memory = table is None
+    if in_memory:
+        table = np.empty(shape)
+    grid = np.meshgrid(*axes[1:], indexing="ij")
+    for i, value in enumerate(axes[0]):
+        table[i] = inference.infer(rulebase, value, *grid, index=index)
+    if not in_memory:
+        table.flush()
+        del table
+        os.replace(table_tmp, table_path)
+        table = np.load(table_path, mmap_mode="r")
+
+    bounds = tuple((float(axis[0]), float(axis[-1])) for axis in axes)
+    rng = np.random.default_rng(0)
+    samples = [rng.uniform(low, high, ERROR_SAMPLES) for low, high in bounds]
+    exact = inference.infer(rulebase, *samples, index=index)
+    approx = interpolate(Surface(table, bounds, np.nan), *samples)
+    defined = ~np.isnan(exact) & ~np.isnan(approx)
+    error = np.abs(exact - approx)[defined]
+    surface = Surface(table, bounds, float(error.max()))
+    if in_memory:
+        return surface
+
+    try:
+        fd, meta_tmp = tempfile.mkstemp(dir=directory, suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "fingerprint": inference.fingerprint(rulebase),
+                "shape": list(shape),
+                "bounds": bounds,
+                "max_error": surface.max_error,
+                "p99_error": float(np.percentile(error, 99)),
+            }, f, indent=2)
+        os.chmod(meta_tmp, 0o644)
+        os.replace(meta_tmp, meta_path)
+        _remove_stale((table_path, meta_path), shape, directory)
+    except OSError:
+        return surface
+    return load_surface(rulebase, shape, directory)
+
+
+def load_surface(rulebase: inference.Rulebase, shape: tuple = DEFAULT_SHAPE,
+                 directory: str = SURFACE_DIR):
+    """
+    Memory-maps the surface for this rulebase, building it first when there
+    is none for the current rulebase fingerprint
+    """
+    table_path, meta_path = _paths(rulebase, shape, directory)
+    if not (os.path.exists(table_path) and os.path.exists(meta_path)):
+        return build_surface(rulebase, shape, directory)
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta["fingerprint"] != inference.fingerprint(rulebase):
+            return build_surface(rulebase, shape, directory)
+        bounds = tuple(tuple(pair) for pair in meta["bounds"])
+        return Surface(np.load(table_path, mmap_mode="r"), bounds, meta["max_error"])
+    except (OSError, ValueError, KeyError):
+        # a truncated or corrupt file is rebuilt like a missing one
+        return build_surface(rulebase, shape, directory)
@@ -0,0 +1,252 @@
+"""
+This module sweeps the model over the input space and stores the results
+on disk, for sensitivity maps of CBR over fibre, liquid limit and omc.
+
+A sweep is a directory holding meta.json, cbr.npy and, for Latin hypercube
+sweeps, inputs.npy. The arrays are memory mapped and filled in fixed-size
+chunks, so memory use does not grow with the number of points, and
+meta.json records how many chunks are done so an interrupted sweep picks up
+where it stopped. Slice plots and partial dependence curves are drawn from
+the stored results without running the model again.
+
+    python sweep.py run sweeps/grid --grid 200 200 200
+    python sweep.py run sweeps/lhs --lhs 1000000 --seed 0
+    python sweep.py slice sweeps/grid --axis OMC --value 30
+    python sweep.py pdp sweeps/lhs
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+from numpy.lib.format import open_memmap
+import charts
+import fuzzy_logic
+import inference
+
+CHUNK_SIZE = 262144
+INPUT_LABELS = fuzzy_logic.VARIABLE_LABELS[:-1]
+
+
+def _default_ranges():
+    return [(float(universe[0]), float(universe[-1])) for universe in fuzzy_logic.get_rulebase().input_universes]
+
+
+def _write_meta(directory: str, meta: dict):
+    tmp = os.path.join(directory, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(directory, "meta.json"))
+
+
+def read_meta(directory: str):
+    with open(os.path.join(directory, "meta.json")) as f:
+        return json.load(f)
+
+
+def create_sweep(directory: str, ranges: list | None = None, grid: list | None = None, samples: int | None = None,
+                 chunk_size: int = CHUNK_SIZE, seed: int = 0, mode: str = "exact"):
+    """
+    Lays out a sweep over ranges, one (low, high) per input, either on a
+    grid with the given number of steps per input or on samples points of
+    a Latin hypercube, and returns its metadata
+    """
+    if (grid is None) == (samples is None):
+        raise ValueError("Give either grid steps or a number of samples")
+    if ranges is None:
+        ranges = _default_ranges()
+    os.makedirs(directory, exist_ok=True)
+    meta = {
+        "kind": "grid" if grid is not None else "lhs",
+        "ranges": [list(map(float, bounds)) for bounds in ranges],
+        "shape": [int(steps) for steps in grid] if grid is not None else [int(samples)],
+        "chunk_size": chunk_size,
+        "seed": seed,
+        "mode": mode,
+        "fingerprint": inference.fingerprint(fuzzy_logic.get_rulebase()),
+        "completed_chunks": 0,
+        "seconds": 0.0,
+    }
+    cbr = open_memmap(os.path.join(directory, "cbr.npy"), mode="w+", dtype=np.float64, shape=tuple(meta["shape"]))
+    cbr[...] = np.nan
+    cbr.flush()
+    del cbr
+
+    if meta["kind"] == "lhs":
+        rng = np.random.default_rng(seed)
+        inputs = open_memmap(os.path.join(directory, "inputs.npy"), mode="w+", dtype=np.float64,
+                             shape=(samples, len(ranges)))
+        for axis, (low, high) in enumerate(ranges):
+            strata = rng.permutation(samples)
+            for start in range(0, samples, chunk_size):
+                stop = min(start + chunk_size, samples)
+                position = (strata[start:stop] + rng.random(stop - start)) / samples
+                inputs[start:stop, axis] = low + position * (high - low)
+        inputs.flush()
+        del inputs
+    _write_meta(directory, meta)
+    return meta
+
+
+def axes(meta: dict):
+    """
+    The points of each input axis of a grid sweep
+    """
+    return [np.linspace(low, high, steps) for (low, high), steps in zip(meta["ranges"], meta["shape"])]
+
+
+def _chunk_inputs(meta: dict, directory: str, start: int, stop: int):
+    if meta["kind"] == "lhs":
+        inputs = np.load(os.path.join(directory, "inputs.npy"), mmap_mode="r")
+        return [np.array(inputs[start:stop, axis]) for axis in range(inputs.shape[1])]
+    index = np.unravel_index(np.arange(start, stop), meta["shape"])
+    return [points[i] for points, i in zip(axes(meta), index)]
+
+
+def run_sweep(directory: str, progress=None):
+    """
+    Scores the chunks not done yet and returns the metadata. Raises
+    ValueError when the model changed since the sweep was created, rather
+    than mixing results of two models in one store.
+    """
+    meta = read_meta(directory)
+    if meta["fingerprint"] != inference.fingerprint(fuzzy_logic.get_rulebase()):
+        raise ValueError(f"The model changed since {directory} was created, start a new sweep")
+    cbr = np.load(os.path.join(directory, "cbr.npy"), mmap_mode="r+")
+    flat = cbr.reshape(-1)
+    size = flat.shape[0]
+    n_chunks = -(-size // meta["chunk_size"])
+    for chunk in range(meta["completed_chunks"], n_chunks):
+        started = time.perf_counter()
+        start = chunk * meta["chunk_size"]
+        stop = min(start + meta["chunk_size"], size)
+        flat[start:stop] = fuzzy_logic.predict_batch(*_chunk_inputs(meta, directory, start, stop), mode=meta["mode"])
+        cbr.flush()
+        meta["completed_chunks"] = chunk + 1
+        meta["seconds"] += time.perf_counter() - started
+        _write_meta(directory, meta)
+        if progress is not None:
+            progress(chunk + 1, n_chunks)
+    return meta
+
+
+def load_sweep(directory: str):
+    """
+    Metadata, inputs and results of a sweep as read only memory maps.
+    Inputs are None for grid sweeps, use axes(meta) instead.
+    """
+    meta = read_meta(directory)
+    cbr = np.load(os.path.join(directory, "cbr.npy"), mmap_mode="r")
+    inputs = np.load(os.path.join(directory, "inputs.npy"), mmap_mode="r") if meta["kind"] == "lhs" else None
+    return meta, inputs, cbr
+
+
+def grid_slice(directory: str, axis: int, value: float):
+    """
+    The 2D slice of a grid sweep at the grid point of axis nearest value,
+    with the points of the two remaining axes
+    """
+    meta, _, cbr = load_sweep(directory)
+    if meta["kind"] != "grid":
+        raise ValueError("Slices need a grid sweep")
+    points = axes(meta)
+    i = int(np.abs(points[axis] - value).argmin())
+    others = [a for a in range(len(points)) if a != axis]
+    return float(points[axis][i]), np.array(np.take(cbr, i, axis=axis)), [points[a] for a in others], others
+
+
+def partial_dependence(directory: str, axis: int, bins: int = 50):
+    """
+    Mean CBR against one input, averaged over the others, with the share
+    of points where a rule fired. Grid sweeps average each grid point of
+    the axis and Latin hypercube sweeps bin the samples. Read in chunks.
+    """
+    meta, inputs, cbr = load_sweep(directory)
+    if meta["kind"] == "grid":
+        x = axes(meta)[axis]
+        totals, counts, seen = np.zeros(len(x)), np.zeros(len(x)), np.zeros(len(x))
+        for i in range(len(x)):
+            values = np.take(cbr, i, axis=axis)
+            defined = ~np.isnan(values)
+            totals[i], counts[i], seen[i] = values[defined].sum(), defined.sum(), values.size
+    else:
+        low, high = meta["ranges"][axis]
+        edges = np.linspace(low, high, bins + 1)
+        x = 0.5 * (edges[:-1] + edges[1:])
+        totals, counts, seen = np.zeros(bins), np.zeros(bins), np.zeros(bins)
+        for start in range(0, cbr.shape[0], meta["chunk_size"]):
+            values = np.array(cbr[start:start + meta["chunk_size"]])
+            which = np.clip(np.searchsorted(edges, inputs[start:start + meta["chunk_size"], axis], side="right") - 1,
+                            0, bins - 1)
+            defined = ~np.isnan(values)
+            totals += np.bincount(which[defined], values[defined], bins)
+            counts += np.bincount(which[defined], minlength=bins)
+            seen += np.bincount(which, minlength=bins)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return x, totals / counts, counts / seen
+
+
+def slice_plot(directory: str, axis: int, value: float, path: str | None = None):
+    """
+    Draws the slice of a grid sweep through value on axis as a heat map
+    """
+    at, values, (x, y), (x_axis, y_axis) = grid_slice(directory, axis, value)
+    if path is None:
+        path = os.path.join(directory, f"slice_{INPUT_LABELS[axis]}_{at:g}.png")
+    charts.draw_slice(path, x, y, values, INPUT_LABELS[x_axis], INPUT_LABELS[y_axis],
+                      f"CBR at {INPUT_LABELS[axis]} = {at:g}")
+    return path
+
+
+def partial_dependence_plot(directory: str, path: str | None = None, bins: int = 50):
+    """
+    Draws the partial dependence curve of every input
+    """
+    if path is None:
+        path = os.path.join(directory, "partial_dependence.png")
+    curves = [partial_dependence(directory, axis, bins) for axis in range(len(INPUT_LABELS))]
+    charts.draw_partial_dependence(path, curves, INPUT_LABELS)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the fuzzy logic model over its input space")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="create a sweep, or resume it if it exists")
+    run_parser.add_argument("directory")
+    layout = run_parser.add_mutually_exclusive_group()
+    layout.add_argument("--grid", type=int, nargs=3, metavar=("F", "LL", "OMC"))
+    layout.add_argument("--lhs", type=int, metavar="SAMPLES")
+    run_parser.add_argument("--ranges", type=float, nargs=6, metavar="BOUND",
+                            help="low and high of F, LL and OMC, defaults to the universes")
+    run_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--mode", choices=["exact", "analytic", "surface"], default="exact")
+    slice_parser = commands.add_parser("slice", help="heat map of a grid sweep at one value of an input")
+    slice_parser.add_argument("directory")
+    slice_parser.add_argument("--axis", choices=INPUT_LABELS, required=True)
+    slice_parser.add_argument("--value", type=float, required=True)
+    slice_parser.add_argument("--output")
+    pdp_parser = commands.add_parser("pdp", help="partial dependence of CBR on each input")
+    pdp_parser.add_argument("directory")
+    pdp_parser.add_argument("--bins", type=int, default=50)
+    pdp_parser.add_argument("--output")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if not os.path.exists(os.path.join(args.directory, "meta.json")):
+            if args.grid is None and args.lhs is None:
+                parser.error("a new sweep needs --grid or --lhs")
+            ranges = None if args.ranges is None else list(zip(args.ranges[::2], args.ranges[1::2]))
+            create_sweep(args.directory, ranges, args.grid, args.lhs, args.chunk_size, args.seed, args.mode)
+        meta = run_sweep(args.directory, lambda done, total: print(f"chunk {done}/{total}", flush=True))
+        print(f"{int(np.prod(meta['shape']))} points in {meta['seconds']:.1f} s")
+    elif args.command == "slice":
+        print(slice_plot(args.directory, INPUT_LABELS.index(args.axis), args.value, args.output))
+    else:
+        print(partial_dependence_plot(args.directory, args.output, args.bins))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+This module provides opt-in instrumentation of the inference engine:
+time spent in each stage, how often and how strongly each rule fires,
+and how many inputs were clipped to the universes or left the output
+undefined. Nothing is recorded unless a Telemetry is passed to infer.
+"""
+
+import json
+import threading
+import numpy as np
+import inference
+
+STAGES = ("fuzzification", "activation", "aggregation", "defuzzification")
+
+
+class Telemetry:
+    """
+    Counters collected over every infer call it is passed to
+    """
+
+    def __init__(self, rulebase: inference.Rulebase, labels: tuple):
+        self.rulebase = rulebase
+        self.labels = labels
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Sets every counter back to zero
+        """
+        n_rules = len(self.rulebase.rules)
+        with self._lock:
+            self.calls = 0
+            self.samples = 0
+            self.undefined = 0
+            self.seconds = dict.fromkeys(STAGES, 0.0)
+            self.clipped = [0] * len(self.rulebase.input_universes)
+            self.fired = np.zeros(n_rules, dtype=np.int64)
+            self.strength_sum = np.zeros(n_rules)
+            self.strength_max = np.zeros(n_rules)
+
+    def record(self, inputs: list, output: np.ndarray, strengths: np.ndarray, rule_ids: np.ndarray, **seconds):
+        """
+        Adds one scored chunk, called by inference.infer
+        """
+        firing = (rule_ids >= 0) & (strengths > 0)
+        ids, values = rule_ids[firing], strengths[firing]
+        with self._lock:
+            self.calls += 1
+            self.samples += len(output)
+            self.undefined += int(np.isnan(output).sum())
+            for stage, elapsed in seconds.items():
+                self.seconds[stage] += elapsed
+            for i, (values_in, universe) in enumerate(zip(inputs, self.rulebase.input_universes)):
+                self.clipped[i] += int(((values_in < universe[0]) | (values_in > universe[-1])).sum())
+            np.add.at(self.fired, ids, 1)
+            np.add.at(self.strength_sum, ids, values)
+            np.maximum.at(self.strength_max, ids, values)
+
+    def _describe(self, rule: np.ndarray):
+        antecedents = " & ".join(f"{label}{term + 1}" for label, term in zip(self.labels, rule[:-1]))
+        return f"{antecedents} -> {self.labels[-1]}{rule[-1] + 1}"
+
+    def to_dict(self):
+        """
+        Counters as a JSON serializable dict. Each rule is reported with its
+        row in the rulebase and the name of the model rule it came from.
+        """
+        names = self.rulebase.rule_names
+        with self._lock:
+            rules = []
+            for rule_id, rule in enumerate(self.rulebase.rules):
+                fired = int(self.fired[rule_id])
+                rules.append({
+                    "rule": rule_id,
+                    "name": names[rule_id] if rule_id < len(names) else None,
+                    "description": self._describe(rule),
+                    "fired": fired,
+                    "mean_strength": float(self.strength_sum[rule_id] / fired) if fired else 0.0,
+                    "max_strength": float(self.strength_max[rule_id]),
+                })
+            return {
+                "calls": self.calls,
+                "samples": self.samples,
+                "undefined_outputs": self.undefined,
+                "clipped_inputs": dict(zip(self.labels, self.clipped)),
+                "stage_seconds": dict(self.seconds),
+                "rules": rules,
+            }
+
+    def write(self, path: str = "./reports/telemetry.json"):
+        """
+        Writes the counters as JSON, next to reports/report.txt by default
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)